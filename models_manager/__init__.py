@@ -3,16 +3,26 @@ from models_manager.converters.constructor import construct_class
 from models_manager.manager.field.enums import FieldGenericEnum
 from models_manager.manager.field.field import Field
 from models_manager.manager.model import Model
+from models_manager.manager.query.aggregates import Avg, Count, Max, Min, Sum
 from models_manager.manager.query.node import Q
+from models_manager.manager.session import Session
 from models_manager.providers.provider import Provider
 from models_manager.schema.provider import SchemaProvider
 from models_manager.schema.schema_typing import resolve_typing
+from models_manager.utils import Row
 
 __all__ = [
     'Q',
+    'Row',
+    'Sum',
+    'Count',
+    'Avg',
+    'Min',
+    'Max',
     'Field',
     'Model',
     'Connect',
+    'Session',
     'Provider',
     'FieldGenericEnum',
     'SchemaProvider',
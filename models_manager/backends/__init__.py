@@ -0,0 +1,33 @@
+from typing import Dict, Optional, Type, Union
+
+from models_manager.backends.base import Backend
+from models_manager.backends.postgresql import PostgreSQLBackend
+from models_manager.backends.sqlite import SQLiteBackend
+from models_manager.manager.exceptions import DatabaseNameError
+
+BACKENDS: Dict[str, Type[Backend]] = {
+    PostgreSQLBackend.name: PostgreSQLBackend,
+    SQLiteBackend.name: SQLiteBackend
+}
+
+
+def get_backend(backend: Optional[Union[str, Backend]] = None) -> Backend:
+    """
+    :param backend: Name of the backend either backend object, by default DATABASE_BACKEND is used
+
+    Example:
+        get_backend('sqlite') -> <SQLiteBackend>
+    """
+    from models_manager.settings import DATABASE_BACKEND
+    safe_backend = backend or DATABASE_BACKEND
+
+    if isinstance(safe_backend, Backend):
+        return safe_backend
+
+    try:
+        return BACKENDS[safe_backend]()
+    except KeyError:
+        raise DatabaseNameError(f'Backend "{safe_backend}" is not supported, use one of {list(BACKENDS)}')
+
+
+__all__ = ['Backend', 'PostgreSQLBackend', 'SQLiteBackend', 'BACKENDS', 'get_backend']
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple
+
+
+class Backend(ABC):
+    """
+    Database backend. Queries of managers are written for PostgreSQL:
+    "%s" placeholders, double quoted identifiers, RETURNING, ``= ANY(%s)``
+    with array parameter. Backend connects to the database and translates
+    such queries and their parameters to own dialect.
+
+    :param name: Name of the backend, which is used in DATABASE_BACKEND setting
+    :param connect_errors: Errors of opening connection, which are retried
+    :param disconnect_errors: Errors of lost connection, after them connection is opened again
+    :param begin_sql: Query, which opens transaction. None if driver opens transaction itself
+    :param supports_synchronous_commit: Transaction can change "synchronous_commit"
+    :param supports_returning_cte: INSERT ... RETURNING can be used inside of WITH
+    :param supports_explain: EXPLAIN with options and JSON format is supported
+    """
+    name: str = None
+    connect_errors: Tuple[type, ...] = ()
+    disconnect_errors: Tuple[type, ...] = ()
+    begin_sql: Optional[str] = None
+    supports_synchronous_commit: bool = False
+    supports_returning_cte: bool = False
+    supports_explain: bool = False
+
+    @abstractmethod
+    def connect(self, dbname: str):
+        """Opens DB-API connection to the database"""
+
+    def prepare(self, sql: str, args: Sequence = ()) -> Tuple[str, Sequence]:
+        """Translates query and parameters to dialect of the backend"""
+        return sql, args
+
+    @abstractmethod
+    def json_records(self, table: str, columns: Sequence[str]) -> str:
+        """
+        Returns SQL of the rows source, which is built from JSON array of objects
+        passed as one parameter. Columns of the rows have types of the table
+        """
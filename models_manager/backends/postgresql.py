@@ -0,0 +1,37 @@
+import json
+from functools import partial
+from typing import Sequence
+from uuid import UUID
+
+import psycopg2
+from psycopg2 import InterfaceError, OperationalError
+from psycopg2.extensions import QuotedString, register_adapter
+from psycopg2.extras import Json, UUID_adapter
+
+from models_manager.backends.base import Backend
+from models_manager.manager.query.params import ArrayParam, JsonParam, to_array_literal
+
+register_adapter(ArrayParam, lambda param: QuotedString(to_array_literal(param)))
+register_adapter(JsonParam, lambda param: Json(param.value, dumps=partial(json.dumps, default=str)))
+# only parameters are adapted, uuid columns are still read as str
+register_adapter(UUID, UUID_adapter)
+
+
+class PostgreSQLBackend(Backend):
+    """
+    Backend over psycopg2. Queries of managers are written for PostgreSQL,
+    so they are executed as is. Connection settings are taken from DATABASE
+    """
+    name = 'postgresql'
+    connect_errors = (OperationalError,)
+    disconnect_errors = (OperationalError, InterfaceError)
+    supports_synchronous_commit = True
+    supports_returning_cte = True
+    supports_explain = True
+
+    def connect(self, dbname: str):
+        from models_manager.settings import DATABASE
+        return psycopg2.connect(**{**DATABASE, 'dbname': dbname})
+
+    def json_records(self, table: str, columns: Sequence[str]) -> str:
+        return f'json_populate_recordset(NULL::"{table}", %s)'
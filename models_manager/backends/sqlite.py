@@ -0,0 +1,86 @@
+import json
+import os
+import re
+import sqlite3
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Sequence, Tuple
+from uuid import UUID
+
+from models_manager.backends.base import Backend
+from models_manager.manager.query.params import ArrayParam, JsonParam
+
+ANY_PATTERN = re.compile(r'= ANY\(%s\)')
+ALL_PATTERN = re.compile(r'<> ALL\(%s\)')
+PLACEHOLDER_PATTERN = re.compile(r'%[s%]')
+
+
+@lru_cache(maxsize=1024)
+def translate_query(sql: str) -> str:
+    """
+    Example:
+        >>> translate_query('SELECT * FROM "user" WHERE "user"."id" = ANY(%s) AND "user"."name" LIKE \\'a%%\\'')
+        'SELECT * FROM "user" WHERE "user"."id" IN (SELECT "value" FROM json_each(?)) AND "user"."name" LIKE \\'a%\\''
+    """
+    sql = ANY_PATTERN.sub('IN (SELECT "value" FROM json_each(%s))', sql)
+    sql = ALL_PATTERN.sub('NOT IN (SELECT "value" FROM json_each(%s))', sql)
+    return PLACEHOLDER_PATTERN.sub(lambda match: '?' if match.group() == '%s' else '%', sql)
+
+
+def to_sqlite_value(value):
+    """
+    Values, which sqlite3 can not store, are converted to text.
+    Array parameter is sent as JSON array, which is read with json_each,
+    JSON parameter is sent as JSON text
+    """
+    if isinstance(value, ArrayParam):
+        return json.dumps([to_sqlite_value(item) for item in value])
+
+    if isinstance(value, JsonParam):
+        value = value.value
+
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+
+    if isinstance(value, (UUID, Decimal, datetime, date, time)):
+        return str(value)
+
+    return value
+
+
+class SQLiteBackend(Backend):
+    """
+    In-process backend over sqlite3, which can be used to test models
+    without PostgreSQL server.
+
+    By default every database is in memory, and all connections to the
+    database inside of the process share it. If DATABASE has "path", then
+    database is file "<path>/<dbname>.sqlite3"
+
+    Example:
+        DATABASE_BACKEND = 'sqlite'
+        DATABASE = {'path': ':memory:'}
+    """
+    name = 'sqlite'
+    connect_errors = (sqlite3.OperationalError,)
+    begin_sql = 'BEGIN'
+
+    def connect(self, dbname: str):
+        from models_manager.settings import DATABASE
+        path = DATABASE.get('path', ':memory:')
+
+        if path == ':memory:':
+            database, uri = f'file:{dbname}?mode=memory&cache=shared', True
+        else:
+            database, uri = os.path.join(path, f'{dbname}.sqlite3'), False
+
+        # transactions are opened explicitly with begin_sql
+        return sqlite3.connect(database, uri=uri, isolation_level=None, check_same_thread=False)
+
+    def prepare(self, sql: str, args: Sequence = ()) -> Tuple[str, Sequence]:
+        return translate_query(sql), tuple(to_sqlite_value(arg) for arg in args)
+
+    def json_records(self, table: str, columns: Sequence[str]) -> str:
+        values = ', '.join([f'json_extract("value", \'$."{column}"\') AS "{column}"' for column in columns])
+        return f'(SELECT {values} FROM json_each(%s))'
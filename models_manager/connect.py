@@ -1,46 +1,280 @@
 import logging
-from typing import Optional
-
-import psycopg2
-from psycopg2 import OperationalError
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar, Token
+from functools import partial
+from time import monotonic, perf_counter, sleep
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 
+from models_manager import settings
+from models_manager.backends import Backend, PostgreSQLBackend, get_backend
+from models_manager.instrumentation import QueryRecord, instrument, is_instrumented, query_operation
 from models_manager.manager.exceptions import DatabaseNameError
-from models_manager.utils import retry
+from models_manager.utils import backoff_delays, retry, serializer
+
+GatherQuery = Union[str, Tuple[str, tuple]]
 
 logging.basicConfig(level=logging.INFO)
 
+_owned_scopes: ContextVar[FrozenSet['QueryManager']] = ContextVar('models_manager_scopes', default=frozenset())
+
+
+def own_scope(manager: 'QueryManager') -> Token:
+    """Marks transaction scope of the manager as opened by the current context, thread either task"""
+    return _owned_scopes.set(_owned_scopes.get() | {manager})
+
 
 class QueryManager:
     """
     Wrapper over for executing query
+
+    If ``connect`` is provided, then lost connection is opened again. Read
+    queries outside of transaction are retried with exponential backoff,
+    see DATABASE_RETRY in settings.py
+
+    Queries are translated to dialect of ``backend`` before execution
     """
 
-    def __init__(self, connection, cursor):
+    def __init__(self, connection, cursor, database: Optional[str] = None, connect: Optional[Callable] = None,
+                 backend: Optional[Backend] = None):
         self._connection = connection
         self._cursor = cursor
+        self._database = database
+        self._connect = connect
+        self._backend = backend or PostgreSQLBackend()
+        self._savepoints: List[Optional[str]] = []
+        self._transactions = 0
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._open()
+
+        return self._connection
+
+    @property
+    def cursor(self):
+        if self._connection is None:
+            self._open()
+
+        return self._cursor
+
+    def open(self):
+        """Opens connection, if it is not opened yet either lost"""
+        if self._is_disconnected():
+            self.invalidate()
+            self._open()
+
+    def _open(self):
+        """Opens new connection instead of invalidated one"""
+        if self._connect is None:
+            raise ConnectionError(f'Connection to "{self._database}" is closed')
+
+        self._connection = self._connect()
+        self._cursor = self._connection.cursor()
+
+    @property
+    def in_transaction(self) -> bool:
+        """Returns True if query executed inside ``atomic`` scope"""
+        return bool(self._savepoints)
+
+    @property
+    def is_owned(self) -> bool:
+        """
+        Returns True if transaction scope was opened in the current context.
+        Connection is shared by coroutines of the thread, but only the
+        coroutine, which opened ``atomic`` either ``isolate``, owns the scope
+        """
+        return self.in_transaction and self in _owned_scopes.get()
+
+    @property
+    def transaction(self) -> Optional[int]:
+        """Returns number of current outer transaction, None if query is not in transaction"""
+        return self._transactions if self._savepoints else None
+
+    def invalidate(self):
+        """Drops connection, new connection will be opened with the next query"""
+        connection, self._connection = self._connection, None
+        try:
+            connection and connection.close()
+        except self._backend.disconnect_errors:
+            pass
+
+    def close(self):
+        self.invalidate()
+        self._savepoints.clear()
+
+    def _is_disconnected(self) -> bool:
+        return self._connection is None or bool(getattr(self._connection, 'closed', 0))
+
+    def _execute(self, query, args):
+        """
+        Executes query. If connection is lost, then connection is invalidated,
+        and idempotent read queries outside of transaction are retried
+        """
+        started = monotonic()
+        try:
+            self.cursor.execute(*self._backend.prepare(query, args))
+        except self._backend.disconnect_errors as error:
+            if not self._is_disconnected():
+                raise
+
+            self.invalidate()
+            if self._connect is None or self.in_transaction or query_operation(query) != 'SELECT':
+                raise
+
+            self._retry(query, args, error, started)
+
+    def _retry(self, query, args, error: Exception, started: float):
+        """Retries read query after lost connection with exponential backoff, see DATABASE_RETRY"""
+        options = dict(settings.DATABASE_RETRY)
+        deadline = options.pop('deadline', None)
+
+        for pause in backoff_delays(**options):
+            if deadline is not None and monotonic() - started + pause > deadline:
+                break
+
+            logging.warning(f'Connection to "{self._database}" is lost: {error}. Retrying in {pause:.2f}s')
+            sleep(pause)
+
+            try:
+                self.cursor.execute(*self._backend.prepare(query, args))
+                return
+            except self._backend.disconnect_errors as retry_error:
+                if not self._is_disconnected():
+                    raise
+
+                self.invalidate()
+                error = retry_error
+
+        raise error
 
     def query(self, query, args=()):
         """
         Wrapper along 'execute' method. Should be used
         to execute sql queries.
 
-        This method also has included logger, so we can see executed queries.
-        To turn off logging queries, change DATABASE_LOGGING to False, in settings.py
+        This method also has included instrumentation, so we can see executed queries,
+        their duration and number of rows. To turn on logging of queries, change
+        DATABASE_LOGGING to True, in settings.py. See ``models_manager.instrumentation``
+
+        Outside of ``atomic`` scope every query is committed. Inside of the scope
+        commit is made once on the scope exit, and errors are raised, so the scope
+        can rollback
         """
-        from models_manager.settings import DATABASE_LOGGING
-        if DATABASE_LOGGING:
-            logging.info(query % args if isinstance(args, tuple) else tuple(args))
+        if self._cursor is None:
+            # first connection is opened outside of query errors handling,
+            # so the caller gets connection error, as it was with eager setup
+            self._open()
+
+        instrumented = is_instrumented()
+        started = perf_counter() if instrumented else 0
+        cursor = self._cursor
 
         try:
-            self._cursor.execute(query, args)
+            self._execute(query, args)
         except Exception as error:
-            self._connection.rollback()
+            if instrumented:
+                instrument(QueryRecord(query, args, self._database, perf_counter() - started, -1, error))
+
             logging.error(error)
-        else:
+            if self.in_transaction:
+                raise
+
+            if not self._is_disconnected():
+                self._connection.rollback()
+
+            return self._cursor or cursor
+
+        if instrumented:
+            instrument(QueryRecord(query, args, self._database, perf_counter() - started, self._cursor.rowcount))
+
+        if not self.in_transaction:
             self._connection.commit()
 
         return self._cursor
 
+    def begin(self, synchronous_commit: Optional[str] = None):
+        """
+        Opens transaction scope. Outer scope uses transaction, which psycopg2
+        opens with the first query, or which is opened with "begin_sql" of the backend.
+        Nested scopes are made with SAVEPOINT
+        """
+        savepoint = f'models_manager_{len(self._savepoints)}' if self._savepoints else None
+        if savepoint:
+            self.cursor.execute(f'SAVEPOINT {savepoint};')
+        else:
+            self._transactions += 1
+            if self._backend.begin_sql:
+                self.cursor.execute(self._backend.begin_sql)
+
+        self._savepoints.append(savepoint)
+
+        if synchronous_commit is not None and self._backend.supports_synchronous_commit:
+            self.cursor.execute('SET LOCAL synchronous_commit TO %s;', (synchronous_commit,))
+
+    def commit(self):
+        """Closes current scope and commits either releases savepoint"""
+        savepoint = self._savepoints.pop()
+        if savepoint:
+            self.cursor.execute(f'RELEASE SAVEPOINT {savepoint};')
+            return
+
+        self.connection.commit()
+
+    def rollback(self):
+        """Closes current scope and rolls back transaction either savepoint"""
+        savepoint = self._savepoints.pop()
+        if self._is_disconnected():
+            # transaction is already lost together with connection
+            return
+
+        if savepoint:
+            self._cursor.execute(f'ROLLBACK TO SAVEPOINT {savepoint};')
+            self._cursor.execute(f'RELEASE SAVEPOINT {savepoint};')
+            return
+
+        self._connection.rollback()
+
+
+class Atomic(ContextDecorator):
+    """
+    Transaction scope. All queries inside of the scope share one
+    transaction, which is committed on exit and rolled back on exception.
+    Nested scopes are made with SAVEPOINT.
+
+    Example:
+        with Connect().atomic('users'):
+            ...
+
+        @Connect().atomic('users', synchronous_commit='off')
+        def setup_users():
+            ...
+    """
+
+    def __init__(self, query_manager: Callable[[], QueryManager], synchronous_commit: Optional[str] = None):
+        self._query_manager = query_manager
+        self._synchronous_commit = synchronous_commit
+        self._managers: List[QueryManager] = []
+        self._tokens: List[Token] = []
+
+    def __enter__(self):
+        manager = self._query_manager()
+        manager.begin(self._synchronous_commit)
+        self._managers.append(manager)
+        self._tokens.append(own_scope(manager))
+        return manager.query
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        manager = self._managers.pop()
+        _owned_scopes.reset(self._tokens.pop())
+        if exc_type is None:
+            manager.commit()
+        else:
+            manager.rollback()
+
+        return False
+
 
 class Connect:
     """
@@ -66,38 +300,167 @@ class Connect:
 
     users = Connect().some
     some('SELECT * FROM "Users"')
+
+    - As transaction scope:
+      with Connect().atomic('users') as query:
+           query('INSERT INTO "Users" ...')
+           query('INSERT INTO "Users" ...')
+
+    - With other backend, by default DATABASE_BACKEND is used:
+      Connect(backend='sqlite').users
     """
 
-    def __init__(self, dbname=None, is_lazy=True):
+    def __init__(self, dbname=None, is_lazy=True, backend: Optional[Union[str, Backend]] = None):
         self.__context_dbname = dbname
+        self.__backend = backend
+        self._query_managers: Dict[str, QueryManager] = {}
 
         if not is_lazy:
-            self._setup_connections(dbname)
+            self.warm_up(*([dbname] if dbname else []))
 
     def __getattr__(self, item):
-        if not self.__dict__.get('_connections'):
-            self._setup_connections()
-
-        connection = self._connections[item]
-        cursor = self._cursors[item]
-        return QueryManager(connection, cursor).query
+        return self._query_manager(item).query
 
     def __enter__(self):
-        try:
-            connection = self._connections[self.__context_dbname]
-            cursor = self._cursors[self.__context_dbname]
-            return QueryManager(connection, cursor).query
-        except KeyError:
+        if self.__context_dbname is None:
             raise DatabaseNameError('To use query in context manager provide "dbname"')
 
+        return self._query_manager(self.__context_dbname).query
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._connections[self.__context_dbname].close()
-        self._cursors[self.__context_dbname].close()
-
-    @retry(times=10, exceptions=(OperationalError,))
-    def _setup_connections(self, dbname: Optional[str] = None):
-        """Setting up connections to multiple databases"""
-        from models_manager.settings import DATABASES, DATABASE
-        databases = DATABASES if dbname is None else [dbname]
-        self._connections = {db: psycopg2.connect(**{**DATABASE, 'dbname': db}) for db in databases}
-        self._cursors = {db: conn.cursor() for conn, db in zip(self._connections.values(), databases)}
+        self._query_manager(self.__context_dbname).close()
+
+    @property
+    def backend(self) -> Backend:
+        """Backend is resolved on first use, so DATABASE_BACKEND can be changed after import"""
+        if not isinstance(self.__backend, Backend):
+            self.__backend = get_backend(self.__backend)
+
+        return self.__backend
+
+    def _query_manager(self, dbname: str) -> QueryManager:
+        """
+        Returns query manager of the database. Connection
+        is not opened here, it is opened with the first query
+        """
+        manager = self._query_managers.get(dbname)
+        if manager is not None:
+            return manager
+
+        if dbname not in settings.DATABASES and dbname != self.__context_dbname:
+            raise DatabaseNameError(f'Database "{dbname}" is not configured, add it to DATABASES')
+
+        manager = QueryManager(None, None, dbname, partial(self._connect_database, dbname), self.backend)
+        return self._query_managers.setdefault(dbname, manager)
+
+    def warm_up(self, *databases: str):
+        """
+        :param databases: Names of the databases, by default all DATABASES are used
+
+        Opens connections concurrently, so startup takes time of the slowest
+        connection. Without warm up connection is opened on the first query.
+
+        Example:
+            Connect().warm_up('users', 'billing')
+        """
+        managers = [self._query_manager(db) for db in (databases or settings.DATABASES)]
+        closed = [manager for manager in managers if manager._is_disconnected()]
+        if len(closed) <= 1:
+            for manager in closed:
+                manager.open()
+            return
+
+        with ThreadPoolExecutor(max_workers=len(closed), thread_name_prefix='models_manager') as executor:
+            for future in [executor.submit(manager.open) for manager in closed]:
+                future.result()
+
+    def atomic(self, dbname: Optional[str] = None, synchronous_commit: Optional[str] = None) -> Atomic:
+        """
+        :param dbname: Name of the database, by default "dbname" of the context is used
+        :param synchronous_commit: Value of "synchronous_commit" for transaction, for example "off"
+        :return: Transaction scope, which can be used as context manager either decorator
+        """
+        safe_dbname = dbname or self.__context_dbname
+        if safe_dbname is None:
+            raise DatabaseNameError('To use atomic provide "dbname"')
+
+        return Atomic(lambda: self._query_manager(safe_dbname), synchronous_commit)
+
+    @contextmanager
+    def isolate(self, *databases: str):
+        """
+        :param databases: Names of the databases, by default all DATABASES are used
+
+        Opens transaction on every database, which is always rolled back on exit.
+        All queries inside of the scope, including ``atomic`` scopes, are not
+        visible after exit. If the scope is nested into other transaction,
+        then SAVEPOINT is used, so only changes of the scope are rolled back.
+
+        Example:
+            with Connect().isolate('users'):
+                Users.manager.create()
+
+            Users.manager.create() is rolled back here
+        """
+        safe_databases = databases or settings.DATABASES
+        self.warm_up(*safe_databases)
+        managers = [self._query_manager(db) for db in safe_databases]
+
+        tokens = []
+        for manager in managers:
+            manager.begin()
+            tokens.append(own_scope(manager))
+
+        try:
+            yield
+        finally:
+            for manager, token in zip(reversed(managers), reversed(tokens)):
+                _owned_scopes.reset(token)
+                manager.rollback()
+
+    def gather(self, queries: Dict[str, GatherQuery], many: bool = True) -> Dict[str, Any]:
+        """
+        Executes queries on multiple databases concurrently. Every database has own
+        connection, so queries run in parallel on the thread pool, and total time
+        is the time of the slowest query.
+
+        :param queries: Query per database name, query is sql either tuple (sql, args)
+        :param many: Return all rows either first row, as ``serializer`` does
+        :return: Serialized rows per database name. If query did not return rows,
+        for example failed query, then None is returned for the database
+
+        Example:
+            Connect().gather({
+                'users': ('SELECT * FROM "users" WHERE "users"."id" = %s', (1,)),
+                'billing': 'SELECT * FROM "accounts"'
+            })
+            -> {'users': [{'id': 1, ...}], 'billing': [{'id': 1, ...}, ...]}
+        """
+        if not queries:
+            return {}
+
+        managers = {db: self._query_manager(db) for db in queries}
+
+        def execute(db: str):
+            query = queries[db]
+            sql, args = (query, ()) if isinstance(query, str) else query
+
+            cursor = managers[db].query(sql, args)
+            return serializer(cursor, many=many) if cursor.description else None
+
+        if len(queries) == 1:
+            db = next(iter(queries))
+            return {db: execute(db)}
+
+        with ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix='models_manager') as executor:
+            futures = {db: executor.submit(execute, db) for db in queries}
+            return {db: future.result() for db, future in futures.items()}
+
+    def close(self):
+        """Closes connections to all databases"""
+        for manager in list(self._query_managers.values()):
+            manager.close()
+
+    def _connect_database(self, dbname: str):
+        """Opens connection to the database, retries with exponential backoff"""
+        return retry(exceptions=self.backend.connect_errors, **settings.DATABASE_RETRY)(self.backend.connect)(dbname)
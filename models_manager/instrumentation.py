@@ -0,0 +1,244 @@
+import logging
+import re
+import threading
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+from models_manager import settings
+from models_manager.manager.exceptions import QueryBudgetError
+
+logger = logging.getLogger('models_manager.queries')
+
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+LIST_PATTERN = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+TABLE_PATTERN = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"?(\w+)"?', re.IGNORECASE)
+SAMPLES_LIMIT = 1024
+
+
+class QueryRecord(NamedTuple):
+    """Information about single executed query"""
+    sql: str
+    args: tuple
+    database: Optional[str]
+    duration: float
+    rows: int
+    error: Optional[Exception] = None
+
+    @property
+    def shape(self) -> str:
+        return query_shape(self.sql)
+
+    @property
+    def operation(self) -> str:
+        return query_operation(self.sql)
+
+    @property
+    def table(self) -> Optional[str]:
+        return query_table(self.sql)
+
+
+@lru_cache(maxsize=1024)
+def query_shape(sql: str) -> str:
+    """
+    Returns query without literals, so queries which differ
+    only by values have the same shape
+
+    Example:
+        >>> query_shape('SELECT * FROM "user" WHERE "user"."id" IN (1, 2, 3)')
+        'SELECT * FROM "user" WHERE "user"."id" IN (...)'
+    """
+    shape = LITERAL_PATTERN.sub('?', sql)
+    return LIST_PATTERN.sub('(...)', shape).strip()
+
+
+@lru_cache(maxsize=1024)
+def query_operation(sql: str) -> str:
+    """
+    Example:
+        >>> query_operation('select * from "user"')
+        'SELECT'
+    """
+    parts = sql.split(maxsplit=1)
+    return parts[0].upper() if parts else ''
+
+
+@lru_cache(maxsize=1024)
+def query_table(sql: str) -> Optional[str]:
+    """
+    Example:
+        >>> query_table('UPDATE "user" SET "name" = %s')
+        'user'
+    """
+    match = TABLE_PATTERN.search(sql)
+    return match.group(1) if match else None
+
+
+class QueryStats:
+    """
+    In-process registry of query durations grouped by query shape.
+
+    Example:
+        query_stats.summary() -> {
+            'SELECT * FROM "user" WHERE "user"."id" = %s': {
+                'count': 10, 'errors': 0, 'rows': 10, 'p50': 0.001, 'p95': 0.003, 'max': 0.004
+            }
+        }
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def record(self, record: QueryRecord):
+        shape = record.shape
+        with self._lock:
+            samples = self._samples.setdefault(shape, deque(maxlen=SAMPLES_LIMIT))
+            samples.append(record.duration)
+
+            totals = self._totals.setdefault(shape, {'count': 0, 'errors': 0, 'rows': 0, 'max': 0.0})
+            totals['count'] += 1
+            totals['errors'] += record.error is not None
+            totals['rows'] += max(record.rows, 0)
+            totals['max'] = max(totals['max'], record.duration)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                shape: {
+                    **totals,
+                    'p50': percentile(self._samples[shape], 50),
+                    'p95': percentile(self._samples[shape], 95)
+                }
+                for shape, totals in self._totals.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+def percentile(samples, percent: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+
+    index = round((len(ordered) - 1) * percent / 100)
+    return ordered[index]
+
+
+query_stats = QueryStats()
+query_listeners: List[Callable[[QueryRecord], None]] = []
+
+
+def is_instrumented() -> bool:
+    """Returns True if executed queries should be measured"""
+    return bool(
+        settings.DATABASE_LOGGING
+        or settings.DATABASE_STATS
+        or settings.DATABASE_SLOW_QUERY_THRESHOLD is not None
+        or query_listeners
+    )
+
+
+def instrument(record: QueryRecord):
+    """Passes record of executed query to logger, statistics and listeners"""
+    if settings.DATABASE_LOGGING:
+        logger.info(
+            '[%s] %s %s (%.2f ms, %s rows)',
+            record.database, record.sql, record.args, record.duration * 1000, record.rows
+        )
+
+    threshold = settings.DATABASE_SLOW_QUERY_THRESHOLD
+    if threshold is not None and record.duration >= threshold:
+        logger.warning(
+            'Slow query [%s] %s %s took %.2f ms',
+            record.database, record.sql, record.args, record.duration * 1000
+        )
+
+    if settings.DATABASE_STATS:
+        query_stats.record(record)
+
+    for listener in tuple(query_listeners):
+        listener(record)
+
+
+class QueryCounter:
+    """
+    Counts queries executed inside of the block.
+
+    :param budget: Max number of queries, if more queries are executed ``QueryBudgetError`` is raised
+    :param repeated: Max number of queries with the same shape. Repeated shape usually means
+    N+1 problem, for example ``get`` in the loop instead of one ``filter``
+    :param database: Count only queries of the database
+
+    Example:
+        with QueryCounter(budget=2, repeated=1) as counter:
+            for user_id in (1, 2, 3):
+                User.manager.get(id=user_id)
+
+        QueryBudgetError: Executed 3 queries, budget is 2
+        Repeated 3 times: SELECT * FROM "user" WHERE "user"."id" = %s
+        ...
+    """
+
+    def __init__(self, budget: Optional[int] = None, repeated: Optional[int] = None, database: Optional[str] = None):
+        self.budget = budget
+        self.repeated = repeated
+        self.database = database
+        self.records: List[QueryRecord] = []
+
+    def __enter__(self) -> 'QueryCounter':
+        query_listeners.append(self._capture)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        query_listeners.remove(self._capture)
+
+        if exc_type is None:
+            self.check()
+
+        return False
+
+    def _capture(self, record: QueryRecord):
+        if self.database is None or record.database == self.database:
+            self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def shapes(self) -> Dict[str, int]:
+        """Number of queries per query shape"""
+        return dict(Counter(record.shape for record in self.records))
+
+    def repeated_shapes(self, threshold: int = 1) -> Dict[str, int]:
+        """Shapes, which were executed more than ``threshold`` times"""
+        return {shape: count for shape, count in self.shapes.items() if count > threshold}
+
+    def report(self) -> str:
+        """Captured queries, repeated shapes are listed first"""
+        lines = [
+            f'Repeated {count} times: {shape}'
+            for shape, count in sorted(self.repeated_shapes().items(), key=lambda item: -item[1])
+        ]
+        lines.extend(f'[{record.database}] {record.sql} {record.args}' for record in self.records)
+        return '\n'.join(lines)
+
+    def check(self):
+        """Raises ``QueryBudgetError`` if budget is exceeded or queries are repeated"""
+        errors = []
+        if self.budget is not None and self.count > self.budget:
+            errors.append(f'Executed {self.count} queries, budget is {self.budget}')
+
+        if self.repeated is not None and self.repeated_shapes(self.repeated):
+            errors.append(f'Same query shape executed more than {self.repeated} times, likely N+1 problem')
+
+        if errors:
+            raise QueryBudgetError('\n'.join([*errors, self.report()]))
@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+CacheTable = Tuple[str, str]
+
+
+class QueryCache:
+    """
+    LRU cache of query results with TTL.
+
+    Entries are stored per table, so all entries of the table can
+    be invalidated, when the table is changed.
+
+    Example:
+        cache = QueryCache(max_size=2)
+        cache.set(('stuff', 'user'), ('SELECT * FROM "user"', ()), [{'id': 1}], ttl=60)
+        cache.get(('stuff', 'user'), ('SELECT * FROM "user"', ())) -> (True, [{'id': 1}])
+        cache.invalidate(('stuff', 'user'))
+        cache.get(('stuff', 'user'), ('SELECT * FROM "user"', ())) -> (False, None)
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[tuple, Tuple[float, Any]]' = OrderedDict()
+        self._tables: Dict[CacheTable, Set[tuple]] = {}
+        self._written: Dict[CacheTable, Hashable] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, table: CacheTable, key: Hashable) -> Tuple[bool, Any]:
+        """Returns tuple (is found, cached result)"""
+        entry_key = (table, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None or entry[0] < monotonic():
+                if entry is not None:
+                    self._remove(entry_key)
+
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, table: CacheTable, key: Hashable, value: Any, ttl: float, transaction: Optional[Hashable] = None):
+        """
+        Stores result. Results of the table, which was changed inside of
+        current ``transaction``, are not stored, because transaction
+        still can be rolled back
+        """
+        entry_key = (table, key)
+        with self._lock:
+            if transaction is not None and self._written.get(table) == transaction:
+                return
+
+            self._entries[entry_key] = (monotonic() + ttl, value)
+            self._entries.move_to_end(entry_key)
+            self._tables.setdefault(table, set()).add(entry_key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, table: CacheTable, transaction: Optional[Hashable] = None):
+        """Removes all entries of the table"""
+        with self._lock:
+            if transaction is not None:
+                self._written[table] = transaction
+
+            for entry_key in self._tables.pop(table, set()):
+                self._entries.pop(entry_key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tables.clear()
+            self._written.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Example:
+            query_cache.stats -> {'hits': 9, 'misses': 1, 'hit_rate': 0.9, 'size': 1, 'evictions': 0}
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._entries),
+            'evictions': self.evictions
+        }
+
+    def _remove(self, entry_key: tuple):
+        self._entries.pop(entry_key, None)
+        keys = self._tables.get(entry_key[0])
+        if keys is not None:
+            keys.discard(entry_key)
+
+
+query_cache = QueryCache()
@@ -36,6 +36,13 @@ class QuerySetOperationError(Exception):
     pass
 
 
+class QueryBudgetError(AssertionError):
+    """
+    Raised when block executes more queries than allowed
+    """
+    pass
+
+
 class ProviderException(Exception):
     pass
 
@@ -0,0 +1,106 @@
+import typing
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict
+from uuid import UUID
+
+from models_manager.manager.query.params import JsonParam
+
+Adapter = Callable[[Any], Any]
+
+
+def to_native(value: Any) -> Any:
+    return value
+
+
+def to_text(value: Any) -> Any:
+    return value if isinstance(value, str) else str(value)
+
+
+def to_json(value: Any) -> JsonParam:
+    return value if isinstance(value, JsonParam) else JsonParam(value)
+
+
+def to_uuid(value: Any) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def to_decimal(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+ADAPTERS: Dict[type, Adapter] = {
+    str: to_text,
+    dict: to_json,
+    list: to_json,
+    UUID: to_uuid,
+    Decimal: to_decimal,
+    int: to_native,
+    float: to_native,
+    bool: to_native,
+    datetime: to_native,
+    date: to_native,
+    time: to_native,
+    timedelta: to_native,
+}
+
+
+def category_origin(category) -> Any:
+    """
+    Example:
+        >>> category_origin(typing.List[int])
+        <class 'list'>
+        >>> category_origin(typing.Optional[typing.Dict[str, int]])
+        <class 'dict'>
+    """
+    origin = typing.get_origin(category)
+    if origin is typing.Union:
+        args = [arg for arg in typing.get_args(category) if arg is not type(None)]
+        return category_origin(args[0]) if len(args) == 1 else None
+
+    return origin or category
+
+
+@lru_cache(maxsize=None)
+def get_adapter(category) -> Adapter:
+    """
+    Returns function, which turns value of the field with the category
+    into query parameter. Values are kept native, so the driver binds
+    them with their own types instead of text, which is cast on the server.
+    Categories without adapter are sent as is
+
+    Example:
+        get_adapter(int)(1) -> 1
+        get_adapter(UUID)('0b7e...') -> UUID('0b7e...')
+        get_adapter(List[int])([1, 2]) -> JsonParam([1, 2])
+    """
+    origin = category_origin(category)
+    for kind in getattr(origin, '__mro__', ()):
+        if kind in ADAPTERS:
+            return ADAPTERS[kind]
+
+    return to_native
+
+
+def adapt_by_type(value: Any) -> Any:
+    """
+    Adapter of fields without category, value is adapted by its own type
+
+    Example:
+        >>> adapt_by_type(5), adapt_by_type({'key': 'value'})
+        (5, JsonParam({'key': 'value'}))
+    """
+    return get_adapter(type(value))(value)
+
+
+def register_adapter(category: type, adapter: Adapter):
+    """
+    Registers adapter for the category, subclasses of the
+    category use it too, if they do not have own adapter
+
+    Example:
+        register_adapter(IPv4Address, str)
+    """
+    ADAPTERS[category] = adapter
+    get_adapter.cache_clear()
@@ -1,15 +1,18 @@
 from datetime import datetime, date, time, timedelta
-from typing import Union, Dict, List, Any
+from typing import Union, Dict, List, Any, Optional
 from uuid import UUID
 
 from jsonschema import validate
 
+from models_manager.manager.field.adapters import Adapter, adapt_by_type, get_adapter
 from models_manager.manager.field.typing import GenericTypes, GenericCategories, GenericChoices
 from models_manager.negative.provider import NegativeValuesProvider
 from models_manager.providers.provider import Provider, NegativeValuesProviderDeprecated
 from models_manager.schema.schema_typing import resolve_typing
 from models_manager.utils import deprecated
 
+UNSET = object()
+
 
 class Field:
 
@@ -31,7 +34,7 @@ class Field:
                  optional: bool = False,
                  value: GenericTypes = None,
                  choices: GenericChoices = None,
-                 category: GenericCategories = str,
+                 category: GenericCategories = UNSET,
                  default: GenericTypes = None):
         self.json = json
         self.null = null
@@ -49,11 +52,16 @@ class Field:
         self.description = description
         self.default = default
         self.only_json = only_json
-        self.category = category
+        # category is str by default, but values of fields without
+        # explicit category are adapted by their own type
+        self.category = str if category is UNSET else category
+        self._is_categorized = category is not UNSET
         self.is_related = is_related
         self.choices = choices
         self.optional = optional
 
+        self._initial = UNSET
+        self._adapter: Optional[Adapter] = None
         self._typing_template = resolve_typing(self.category)
 
     def _with_ensure_value_valid(self, value: Any, json_key=True, ignore_validation=False) -> Any:
@@ -118,6 +126,65 @@ class Field:
             self._with_ensure_value_valid(value)
         self._value = value
 
+    @property
+    def raw_value(self) -> Any:
+        """
+        Returns stored value without default, None for NULL column of
+        object loaded from database, so NULL is not replaced with default
+
+        Example:
+            >>> name = Field(json='name', category=str, default='some')
+            >>> name.raw_value is None, name.value
+            (True, 'some')
+        """
+        return self._value
+
+    @property
+    def is_changed(self) -> bool:
+        """
+        Returns True if value was changed after ``mark_unchanged``.
+        Fields of objects loaded from database are marked unchanged.
+
+        Note that changes inside of mutable value, for example ``field.value.append(1)``,
+        are not tracked. Set new value instead.
+
+        Example:
+            >>> name = Field(category=str, value='some')
+            >>> name.mark_unchanged()
+            >>> name.is_changed
+            False
+            >>> name.value = 'other'
+            >>> name.is_changed
+            True
+        """
+        return self._initial is UNSET or self._value != self._initial
+
+    def to_db(self, value: Any) -> Any:
+        """
+        Turns value into query parameter with adapter of the field category.
+        Adapter is resolved once per field. If category was not set, then
+        value is adapted by its own type
+
+        Example:
+            >>> Field(category=int).to_db(1)
+            1
+            >>> Field(category=dict).to_db({'key': 'value'})
+            JsonParam({'key': 'value'})
+            >>> Field(category=str).to_db(5), Field().to_db(5)
+            ('5', 5)
+        """
+        if value is None:
+            return None
+
+        if self._adapter is None:
+            self._adapter = get_adapter(self.category) if self._is_categorized else adapt_by_type
+
+        return self._adapter(value)
+
+    def mark_unchanged(self):
+        """Remembers current value, so ``is_changed`` will be False until value is changed"""
+        self._initial = self._value
+
     @property
     def get_default(self) -> GenericTypes:
         """
@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Optional
+
+from models_manager import settings
+from models_manager.manager.managers.database import DatabaseManager, bind_thread_connection, current_connection
+from models_manager.manager.query.builder import get_query
+from models_manager.manager.query_set import QuerySet
+from models_manager.utils import normalize_model
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns executor of async managers. Every worker thread has own
+    connections, so DATABASE_POOL_SIZE is max number of connections
+    per database, which are used by async managers
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.DATABASE_POOL_SIZE,
+                thread_name_prefix='models_manager_async',
+                initializer=bind_thread_connection
+            )
+
+        return _executor
+
+
+def fetched(result):
+    """Loads rows of lazy QuerySet, so they are not fetched later in event loop"""
+    if isinstance(result, QuerySet):
+        len(result)
+
+    return result
+
+
+class AsyncDatabaseManager(DatabaseManager):
+    """
+    Async counterpart of ``DatabaseManager``. Queries are executed on the pool
+    of worker threads, so event loop is not blocked, and concurrent coroutines
+    use different connections. Query building and hydration are the same as
+    in sync methods.
+
+    If database of the model is inside of ``atomic`` either ``isolate`` scope,
+    which was opened by the current coroutine, then query is executed in the
+    current thread, because transaction belongs to the connection of this thread.
+    Other coroutines use worker threads and are not joined to the transaction.
+
+    Example:
+        user = await User.manager.aget(id=1, as_json=False)
+        users = await User.manager.afilter(username='some')
+
+        async for user in User.manager.astream(as_json=False):
+            ...
+    """
+
+    async def _in_executor(self, func: Callable, *args, **kwargs):
+        call = partial(contextvars.copy_context().run, func, *args, **kwargs)
+        if current_connection()._query_manager(self._database).is_owned:
+            return call()
+
+        return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
+    async def aget(self, *args, as_json=True, **kwargs):
+        return await self._in_executor(self.get, *args, as_json=as_json, **kwargs)
+
+    async def afilter(self, *args, as_json=True, **kwargs):
+        """With as_json=False returned QuerySet is already fetched"""
+        return await self._in_executor(lambda: fetched(self.filter(*args, as_json=as_json, **kwargs)))
+
+    async def acreate(self, as_json=True, **kwargs):
+        return await self._in_executor(self.create, as_json=as_json, **kwargs)
+
+    async def aupdate(self, as_json=True, **kwargs):
+        return await self._in_executor(self.update, as_json=as_json, **kwargs)
+
+    async def adelete(self):
+        return await self._in_executor(self.delete)
+
+    async def asave(self):
+        return await self._in_executor(self.save)
+
+    async def acount(self, *args, **kwargs) -> int:
+        return await self._in_executor(self.count, *args, **kwargs)
+
+    async def ais_exists(self, *args, **kwargs) -> bool:
+        return await self._in_executor(self.is_exists, *args, **kwargs)
+
+    def __batch(self, query: str, params: tuple, last, batch_size: int, as_rows: bool) -> list:
+        model = normalize_model(self._model)
+        column = f'"{model}"."{self._identity}"'
+        conditions = [f'({query})'] if query else []
+        args = list(params)
+
+        if last is not None:
+            conditions.append(f'{column} > %s')
+            args.append(last)
+
+        sql = f'SELECT * FROM "{model}"'
+        if conditions:
+            sql += f' WHERE {" AND ".join(conditions)}'
+
+        args.append(batch_size)
+        return self._select(f'{sql} ORDER BY {column} LIMIT %s', tuple(args), many=True, as_rows=as_rows)
+
+    async def astream(self, *args, as_json=True, as_rows=True, batch_size: int = 1000, **kwargs) -> AsyncIterator:
+        """
+        Streams rows in batches ordered by identity. Only one batch is in memory,
+        and every batch is fetched with keyset condition, so deep batches are
+        as fast as the first one. Rows are ``Row`` objects, dicts with as_rows=False
+
+        Example:
+        async for user in User.manager.astream(username__like='some%', as_json=False, batch_size=100):
+            ...
+
+        SELECT * FROM "user" WHERE ("user"."username" LIKE %s) ORDER BY "user"."id" LIMIT %s;
+        SELECT * FROM "user" WHERE ("user"."username" LIKE %s) AND "user"."id" > %s ORDER BY "user"."id" LIMIT %s;
+        """
+        query, params = get_query(normalize_model(self._model), *args, **kwargs)
+        last = None
+
+        while True:
+            rows = await self._in_executor(self.__batch, query, params, last, batch_size, as_rows)
+            for row in rows:
+                yield row if as_json else self._to_instance(row)
+
+            if len(rows) < batch_size:
+                return
+
+            last = rows[-1][self._identity]
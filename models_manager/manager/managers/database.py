@@ -1,22 +1,97 @@
+import json
 import logging
-from typing import Dict, List, Union
+import threading
+from typing import Dict, List, Mapping, Optional, Union
 
-from models_manager.connect import Connect
+from models_manager.backends import Backend
+from models_manager.connect import Atomic, Connect
+from models_manager.manager.cache import CacheTable, query_cache
 from models_manager.manager.exceptions import ModelDoesNotExists, ModelOperationError
 from models_manager.manager.field.field import Field
 from models_manager.manager.managers.base import BaseManager
+from models_manager.manager.query.aggregates import Aggregate
 from models_manager.manager.query.builder import get_query
+from models_manager.manager.query.params import ArrayParam
 from models_manager.manager.query_set import QuerySet
-from models_manager.utils import normalize_model, serializer, dump_value, dump_fields, binding
+from models_manager.manager.session import IdentityKey, Session
+from models_manager.utils import normalize_model, serializer, dump_fields, binding
 
 connection = Connect()
 
+_local = threading.local()
+
+
+def current_connection() -> Connect:
+    """
+    Returns connection of current thread. Worker threads of async
+    managers have own connections, other threads share ``connection``
+    """
+    return getattr(_local, 'connection', None) or connection
+
+
+def bind_thread_connection():
+    """
+    Gives current thread own connection, used as initializer of worker threads.
+    Connection uses the same backend as shared ``connection``
+    """
+    _local.connection = Connect(backend=connection.backend)
+
 
 class DatabaseManager(BaseManager):
+    def __init__(self, model, mro, **kwargs):
+        super().__init__(model, mro, **kwargs)
+
+        self._cache_ttl = kwargs.get('database_cache_ttl')
 
     @property
     def _lazy_query(self):
-        return getattr(connection, self._database, None)
+        return getattr(current_connection(), self._database, None)
+
+    @property
+    def _backend(self) -> Backend:
+        return current_connection().backend
+
+    @property
+    def _table(self) -> CacheTable:
+        return self._database, normalize_model(self._model)
+
+    @property
+    def _transaction(self):
+        return current_connection()._query_manager(self._database).transaction
+
+    def _select(self, sql: str, args=(), many=False, as_rows=False):
+        """
+        Executes select query and serializes result.
+
+        If model has "cache_ttl" in Config, then result is cached by
+        (table, sql, args). Cached dicts are copied, so changes of returned
+        rows do not affect cache. ``Row`` objects are read-only and returned as is
+        """
+        if self._cache_ttl is None:
+            return serializer(self._lazy_query(sql, args), many=many, as_rows=as_rows)
+
+        key = (sql, tuple(args), many, as_rows)
+        try:
+            is_found, result = query_cache.get(self._table, key)
+        except TypeError:
+            # unhashable args, such query can not be cached
+            return serializer(self._lazy_query(sql, args), many=many, as_rows=as_rows)
+
+        if not is_found:
+            result = serializer(self._lazy_query(sql, args), many=many, as_rows=as_rows)
+            query_cache.set(self._table, key, result, self._cache_ttl, self._transaction)
+
+        if as_rows:
+            return list(result) if isinstance(result, list) else result
+
+        if isinstance(result, list):
+            return [dict(row) for row in result]
+
+        return result and dict(result)
+
+    def _invalidate(self):
+        """Removes cached results of the model table. Should be called after every write"""
+        query_cache.invalidate(self._table, self._transaction)
 
     @property
     def __only_db_attrs(self) -> dict:
@@ -39,7 +114,7 @@ class DatabaseManager(BaseManager):
             if not value.only_json
         }
 
-    def __as_json(self, as_json, result) -> Union[QuerySet, 'DatabaseManager']:
+    def __as_json(self, as_json, result, refresh=False) -> Union[QuerySet, 'DatabaseManager']:
         """
         Result constructor. Makes result depending on 'as_json' param.
         - If as_json=True will return dict.
@@ -50,14 +125,111 @@ class DatabaseManager(BaseManager):
             return result
 
         if isinstance(result, list):
-            instances = [
-                type(self._model, self._mro, self._resolve_attrs(**{**self.__dict__, **(row or {})}, is_lazy=True))()
-                for row in result
-            ]
+            instances = [self._to_instance(row, refresh) for row in result]
             return QuerySet(self._model, self._identity, self._lazy_query, self._mro, instances, self)
 
-        payload = {**self.__dict__, **(result or {})}
-        return type(self._model, self._mro, self._resolve_attrs(**payload, is_lazy=True))()
+        return self._to_instance(result, refresh)
+
+    def _identity_key(self, value) -> IdentityKey:
+        return self._database, self._model, value
+
+    def _to_instance(self, row: Optional[dict], refresh=False):
+        """
+        Builds model object from database row.
+
+        Inside of ``Session`` object is taken from identity map, so the row
+        is hydrated only once. With refresh=True values of the existing
+        object are updated from the row
+        """
+        session = Session.current()
+        if session is None or not row or row.get(self._identity) is None:
+            return self.__hydrate(row)
+
+        key = self._identity_key(row[self._identity])
+        instance = session.get(key)
+        if instance is None:
+            instance = self.__hydrate(row)
+            session.add(key, instance)
+        elif refresh:
+            instance.manager.apply_row(row)
+
+        return instance
+
+    def __hydrate(self, row: Optional[dict]):
+        payload = {**self.__dict__, **(row or {})}
+        instance = type(self._model, self._mro, self._resolve_attrs(**payload, is_lazy=True))()
+        # model class resolves missing values with defaults, so NULL columns are applied again
+        instance.manager.apply_row(row or {})
+        return instance
+
+    def apply_row(self, row: dict):
+        """Updates values of the object fields from database row"""
+        for field, value in row.items():
+            for attr in (field, f'_meta__{field}'):
+                if isinstance(self.__dict__.get(attr), Field):
+                    self.__dict__[attr].value = value
+
+        self.mark_unchanged()
+
+    def mark_unchanged(self):
+        """Marks all fields unchanged, used after loading object from database"""
+        for field in self._fields_as_original().values():
+            field.mark_unchanged()
+
+    def changed_fields(self) -> Dict[str, Field]:
+        """
+        Returns database fields, which were changed after loading
+
+        Example:
+        some = MyModel.manager.get(id=1, as_json=False)
+        some.name.value = 'other'
+        some.manager.changed_fields() -> {'name': <Field: other>}
+        """
+        return {field: value for field, value in self.__only_db_attrs.items() if value.is_changed}
+
+    def save(self):
+        """
+        Used to save changes of single instance. Only changed fields
+        are updated, if nothing was changed, then query is not executed
+
+        Example:
+
+        some = MyModel.manager.get(id=1, as_json=False)
+        some.name.value = 'New Name'
+        some.manager.save() -> UPDATE "my_model" SET "name" = 'New Name' WHERE "my_model"."id" = 1
+        some.manager.save() -> nothing to update, no query
+        """
+        changed = self.changed_fields()
+        if not changed:
+            return
+
+        model = normalize_model(self._model)
+        values = ', '.join([f'"{field}" = %s' for field in changed])
+        sql = f'UPDATE "{model}" SET {values} WHERE "{model}"."{self._identity}" = %s RETURNING *;'
+
+        identity = self.__dict__[self._identity].value
+        cursor = self._lazy_query(sql, [*(field.to_db(field.raw_value) for field in changed.values()), identity])
+        result = serializer(cursor)
+        self._invalidate()
+
+        if result:
+            self.apply_row(result)
+
+    def atomic(self, synchronous_commit: Optional[str] = None) -> Atomic:
+        """
+        Transaction scope for the model database. Can be used as
+        context manager either decorator. Nested scopes use SAVEPOINT
+
+        Example:
+        with MyModel.manager.atomic():
+            MyModel.manager.create()
+            MyModel.manager.create()
+
+        @MyModel.manager.atomic(synchronous_commit='off')
+        def setup():
+            ...
+        """
+        return current_connection().atomic(self._database, synchronous_commit)
 
     def fields(self, json_key: bool = True) -> Dict[str, Field]:
         return self._fields_as_original(json_key)
@@ -95,22 +267,36 @@ class DatabaseManager(BaseManager):
            password: str = Field()
 
         MyModel.manager.db_values -> [1, 'some_last_name', None]
+
+        Values are adapted with category of the field, so callable defaults
+        are sent with native types, dict and list values are sent as JSON
         """
         values = []
         for key, value in self.__only_db_attrs.items():
             if key in kwargs.keys():
-                values.append(kwargs[key])
+                values.append(value.to_db(kwargs[key]))
                 continue
 
             if getattr(value, 'default', None) is not None:
-                db_value = str(value.default()) if callable(value.default) else value.default
-                values.append(db_value)
+                db_value = value.default() if callable(value.default) else value.default
+                values.append(value.to_db(db_value))
                 continue
 
             values.append(None)
 
         return values
 
+    def adapt_values(self, **kwargs) -> list:
+        """
+        Adapts values with categories of the fields, used as parameters of SET clause.
+        Values of unknown fields are sent as is
+
+        Example:
+        MyModel.manager.adapt_values(name='some', payload={'key': 'value'}) -> ['some', JsonParam({'key': 'value'})]
+        """
+        fields = self.fields(json_key=False)
+        return [fields[key].to_db(value) if key in fields else value for key, value in kwargs.items()]
+
     def db_fields(self, *args, **kwargs) -> list:
         """
         Getting model fields and skip only_json fields
@@ -139,16 +325,24 @@ class DatabaseManager(BaseManager):
         Example:
         MyModel.manager.get(id=1) -> {'id': 1, 'username': 'some'}
         MyModel.manager.get(id=1, as_json=False) -> <class '__main__.Activities'>
+
+        Inside of ``Session`` object is taken from identity map without query,
+        if it is requested only by identity
         """
+        session = Session.current()
+        if session is not None and not as_json and not args and list(kwargs) == [self._identity]:
+            instance = session.get(self._identity_key(kwargs[self._identity]))
+            if instance is not None:
+                return instance
+
         model = normalize_model(self._model)
         sql = f'SELECT * FROM "{model}"'
 
-        query = get_query(model, *args, **kwargs)
+        query, params = get_query(model, *args, **kwargs)
         if query:
             sql += f' WHERE {query}'
 
-        cursor = self._lazy_query(sql)
-        result = serializer(cursor, many=False)
+        result = self._select(sql, params, many=False)
 
         if not result:
             raise ModelDoesNotExists(f'"{self._model}" with {kwargs} does not exists')
@@ -160,14 +354,15 @@ class DatabaseManager(BaseManager):
         fields = self.db_fields()
         values = self.db_values(**kwargs)
 
-        for key, value in kwargs.items():
-            index = fields.index(key)
-            values[index] = value
+        unknown = [key for key in kwargs if key not in fields]
+        if unknown:
+            raise ValueError(f'{unknown} are not database fields of "{self._model}"')
 
         sql = f'INSERT INTO "{model}" ({dump_fields(fields)}) VALUES ({binding(values)}) RETURNING *;'
 
         cursor = self._lazy_query(sql, values)
         result = serializer(cursor)
+        self._invalidate()
 
         return self.__as_json(as_json, result)
 
@@ -183,6 +378,11 @@ class DatabaseManager(BaseManager):
         model = normalize_model(self._model)
         sql = f'DELETE FROM "{model}" WHERE "{model}"."{self._identity}" = %s;'
         self._lazy_query(sql, (self.__dict__[self._identity].value,))
+        self._invalidate()
+
+        session = Session.current()
+        if session is not None:
+            session.remove(self._identity_key(self.__dict__[self._identity].value))
 
     def update(self, as_json=True, **kwargs):
         """
@@ -201,27 +401,103 @@ class DatabaseManager(BaseManager):
                 'Example .update(Name="Some")'
             )
         model = normalize_model(self._model)
-        values = ', '.join([f'"{key}" = {dump_value(value)}' for key, value in kwargs.items()])
+        values = ', '.join([f'"{key}" = %s' for key in kwargs])
 
         sql = f'UPDATE "{model}" SET {values} WHERE "{model}"."{self._identity}" = %s RETURNING*;'
 
-        cursor = self._lazy_query(sql, (self.__dict__[self._identity].value,))
+        cursor = self._lazy_query(sql, (*self.adapt_values(**kwargs), self.__dict__[self._identity].value))
         result = serializer(cursor)
+        self._invalidate()
 
-        return self.__as_json(as_json, result)
+        return self.__as_json(as_json, result, refresh=True)
+
+    def update_many(self, instances: list, fields: Optional[List[str]] = None, batch_size: int = 1000) -> int:
+        """
+        Used to update multiple instances with different values
+
+        :param instances: Model objects, dicts either rows of filter with identity and values
+        :param fields: Fields to update, by default all fields except identity
+        :param batch_size: Number of rows updated with one query
+        :return: Number of updated rows
+
+        Rows of every batch are sent as one JSON parameter, so whole batch
+        is updated with one UPDATE ... FROM json_populate_recordset(...), or
+        rows source of other backend. Columns get types of the table, all
+        batches are executed in one transaction.
 
-    def filter(self, *args, as_json=True, **kwargs):
+        Passed objects are marked unchanged. Inside of ``Session`` other
+        mapped objects of updated rows are evicted from identity map.
+
+        Example:
+        users = MyModel.manager.filter(name='some', as_json=False)
+        for user in users:
+            user.name.value = f'new {user.id.value}'
+
+        MyModel.manager.update_many(users, fields=['name']) -> 2
+        MyModel.manager.update_many([{'id': 1, 'name': 'first'}, {'id': 2, 'name': 'second'}]) -> 2
+        """
+        model = normalize_model(self._model)
+        safe_fields = fields or [field for field in self.db_fields() if field != self._identity]
+        columns = [self._identity, *safe_fields]
+
+        values = ', '.join([f'"{field}" = "values"."{field}"' for field in safe_fields])
+        sql = (
+            f'UPDATE "{model}" SET {values} FROM {self._backend.json_records(model, columns)} AS "values" '
+            f'WHERE "{model}"."{self._identity}" = "values"."{self._identity}";'
+        )
+
+        rows = [
+            {column: instance[column] if isinstance(instance, Mapping) else getattr(instance, column).raw_value
+             for column in columns}
+            for instance in instances
+        ]
+
+        updated = 0
+        with self.atomic():
+            for start in range(0, len(rows), batch_size):
+                cursor = self._lazy_query(sql, (json.dumps(rows[start:start + batch_size], default=str),))
+                updated += cursor.rowcount
+
+        self._invalidate()
+        self.__forget_updated(instances, rows)
+        return updated
+
+    def __forget_updated(self, instances: list, rows: List[dict]):
+        """
+        Passed objects are marked unchanged, other objects of the session
+        with updated identities are evicted, so they are fetched again
+        """
+        session = Session.current()
+        for instance, row in zip(instances, rows):
+            if not isinstance(instance, Mapping):
+                instance.manager.mark_unchanged()
+
+            if session is None:
+                continue
+
+            key = self._identity_key(row[self._identity])
+            if session.get(key) is not instance:
+                session.remove(key)
+
+    def filter(self, *args, as_json=True, as_rows=True, **kwargs):
         """
         Getting db instances
 
         Example:
-        MyModel.manager.filter(id=1) -> [{'id': 1, 'username': 'some'}]
+        MyModel.manager.filter(id=1) -> [Row({'id': 1, 'username': 'some'})]
+        MyModel.manager.filter(id=1, as_rows=False) -> [{'id': 1, 'username': 'some'}]
         MyModel.manager.filter(id=1, as_json=False) -> [<class '__main__.Activities'>]
+
+        With as_json=True rows are read-only mappings, which are compared
+        equal to dicts, use ``row.to_dict()`` to get dict. Rows are not dicts,
+        so with json.dumps and jsonschema validation use as_rows=False
+
+        With as_json=False returned QuerySet is lazy, rows will be fetched on first access
         """
         model = normalize_model(self._model)
         sql = f'SELECT * FROM "{model}"'
         values = tuple(kwargs.values())
-        query = get_query(model, *args, **kwargs)
+        query, params = get_query(model, *args, **kwargs)
 
         if query:
             sql += f' WHERE {query}'
@@ -231,8 +507,13 @@ class DatabaseManager(BaseManager):
                 logging.warning(f'Values is empty {values}({type(values)}). Nothing to query')
                 return self.__as_json(as_json, [])
 
-        cursor = self._lazy_query(sql)
-        result = serializer(cursor, many=True)
+        if not as_json:
+            # rows will be fetched on first access, so count() and similar
+            # operations can be resolved on the database side
+            return QuerySet(self._model, self._identity, self._lazy_query, self._mro, None, self,
+                            where=query, params=params)
+
+        result = self._select(sql, params, many=True, as_rows=as_rows)
 
         return self.__as_json(as_json, result)
 
@@ -248,24 +529,264 @@ class DatabaseManager(BaseManager):
         MyModel.manager.is_exists(id='random') -> False
         """
         model = normalize_model(self._model)
-        sql = f'SELECT NULL FROM "{model}"'
-        query = get_query(model, *args, **kwargs)
+        sql = f'SELECT 1 FROM "{model}"'
+        query, params = get_query(model, *args, **kwargs)
 
         if query:
             sql += f' WHERE {query}'
 
-        cursor = self._lazy_query(sql)
-        return bool(cursor.fetchall())
+        cursor = self._lazy_query(f'SELECT EXISTS({sql} LIMIT 1);', params)
+        return bool(cursor.fetchone()[0])
 
-    def get_or_create(self, *args, as_json=True, **kwargs):
+    def in_bulk(self, ids, as_json=True, field: Optional[str] = None) -> dict:
+        """
+        Returns instances by identities with one query. Identities
+        are sent as one array parameter, so query is the same for any
+        number of identities. Missing identities are not included.
+
+        Inside of ``Session`` objects, which are already in identity map,
+        are not queried
+
+        :param ids: Values of identity
+        :param as_json: Return dicts either model objects
+        :param field: Unique field, which is used instead of identity
+
+        Example:
+        MyModel.manager.in_bulk([1, 2, 100]) -> {1: {'id': 1, ...}, 2: {'id': 2, ...}}
+        MyModel.manager.in_bulk([1, 2], as_json=False) -> {1: <MyModel 1>, 2: <MyModel 2>}
+        MyModel.manager.in_bulk(['some@mail.com'], field='email') -> {'some@mail.com': {'id': 1, ...}}
+        """
+        result = {}
+        safe_ids = list(ids)
+        safe_field = field or self._identity
+
+        session = Session.current()
+        if session is not None and not as_json and safe_field == self._identity:
+            for identity in safe_ids:
+                instance = session.get(self._identity_key(identity))
+                if instance is not None:
+                    result[identity] = instance
+
+            safe_ids = [identity for identity in safe_ids if identity not in result]
+
+        if not safe_ids:
+            return result
+
+        model = normalize_model(self._model)
+        sql = f'SELECT * FROM "{model}" WHERE "{model}"."{safe_field}" = ANY(%s)'
+        rows = self._select(sql, (ArrayParam(safe_ids),), many=True)
+
+        for row in rows:
+            result[row[safe_field]] = row if as_json else self._to_instance(row)
+
+        return result
+
+    def exists_many(self, ids) -> set:
+        """
+        Returns set of identities, which exist in database. Made with one
+        query and one array parameter
+
+        Example:
+        MyModel.manager.exists_many([1, 2, 100]) -> {1, 2}
+        """
+        safe_ids = list(ids)
+        if not safe_ids:
+            return set()
+
+        model = normalize_model(self._model)
+        sql = f'SELECT "{model}"."{self._identity}" FROM "{model}" WHERE "{model}"."{self._identity}" = ANY(%s)'
+
+        cursor = self._lazy_query(sql, (ArrayParam(safe_ids),))
+        return {row[0] for row in cursor.fetchall()}
+
+    def count(self, *args, **kwargs) -> int:
+        """
+        Returns number of rows matching the query. Counting is made
+        on the database side, so rows are not transferred.
+
+        Example:
+        MyModel.manager.count() -> 10
+        MyModel.manager.count(id__in=(1, 2, 3)) -> 3
+        """
+        model = normalize_model(self._model)
+        sql = f'SELECT COUNT(*) FROM "{model}"'
+        query, params = get_query(model, *args, **kwargs)
+
+        if query:
+            sql += f' WHERE {query}'
+
+        cursor = self._lazy_query(sql, params)
+        return cursor.fetchone()[0]
+
+    def aggregate(self, *args: Aggregate, **kwargs: Aggregate) -> dict:
+        """
+        Calculates aggregates for all rows of the table on the database side
+
+        Example:
+        MyModel.manager.aggregate(Sum('amount'), Count('*')) -> {'amount__sum': 300, 'count': 3}
+        MyModel.manager.filter(status='paid', as_json=False).aggregate(Sum('amount')) -> {'amount__sum': 200}
+        """
+        return self.filter(as_json=False).aggregate(*args, **kwargs)
+
+    def group_by(self, *fields: str) -> QuerySet:
+        """
+        Example:
+        MyModel.manager.group_by('status').annotate(Count('*')) -> [{'status': 'paid', 'count': 2}, ...]
+        """
+        return self.filter(as_json=False).group_by(*fields)
+
+    def distinct(self, *fields: str) -> List[dict]:
+        """
+        Example:
+        MyModel.manager.distinct('status') -> [{'status': 'paid'}, {'status': 'new'}]
+        """
+        return self.filter(as_json=False).distinct(*fields)
+
+    def __conflict(self, conflict_fields: List[str], update_fields: List[str]) -> str:
+        """
+        Builds ON CONFLICT clause. If there is nothing to update, then
+        conflicting rows are skipped
+        """
+        if not conflict_fields:
+            raise ModelOperationError(
+                'You should provide at least one conflict field. '
+                'Example .upsert(conflict_fields=["email"], email="some")'
+            )
+
+        if not update_fields:
+            return f'ON CONFLICT ({dump_fields(conflict_fields)}) DO NOTHING'
+
+        values = ', '.join([f'"{field}" = EXCLUDED."{field}"' for field in update_fields])
+        return f'ON CONFLICT ({dump_fields(conflict_fields)}) DO UPDATE SET {values}'
+
+    def get_or_create(self, *args, as_json=True, conflict_fields: Optional[List[str]] = None, **kwargs):
         """
         Will return existing instance if such exists else
         will create such instance and return it.
 
+        If ``conflict_fields`` are provided, then it is made with one query
+        INSERT ... ON CONFLICT DO NOTHING, which is safe under concurrency.
+        Conflict fields should have unique constraint.
+
         Example:
         MyModel.manager.get_or_create(name='some') -> {'id': 1, 'name': 'some'}
+        MyModel.manager.get_or_create(name='some', conflict_fields=['name']) -> {'id': 1, 'name': 'some'}
         """
-        try:
-            return self.get(as_json=as_json, *args, **kwargs)
-        except ModelDoesNotExists:
-            return self.create(as_json, **kwargs)
+        if conflict_fields is None:
+            try:
+                return self.get(as_json=as_json, *args, **kwargs)
+            except ModelDoesNotExists:
+                return self.create(as_json, **kwargs)
+
+        model = normalize_model(self._model)
+        fields = self.db_fields()
+        values = self.db_values(**kwargs)
+        lookup = {field: values[fields.index(field)] for field in conflict_fields}
+        where = ' AND '.join([f'"{model}"."{field}" = %s' for field in lookup])
+
+        insert = (
+            f'INSERT INTO "{model}" ({dump_fields(fields)}) VALUES ({binding(values)}) '
+            f'{self.__conflict(conflict_fields, [])} RETURNING *'
+        )
+
+        if self._backend.supports_returning_cte:
+            sql = (
+                f'WITH "inserted" AS ({insert}) '
+                f'SELECT * FROM "inserted" UNION ALL SELECT * FROM "{model}" WHERE {where} LIMIT 1;'
+            )
+            cursor = self._lazy_query(sql, [*values, *lookup.values()])
+        else:
+            # existing row is taken with the second query below
+            cursor = self._lazy_query(f'{insert};', values)
+
+        result = serializer(cursor)
+        self._invalidate()
+
+        if not result:
+            # conflicting row was not returned by the backend, or it was
+            # committed after the query snapshot was taken
+            return self.get(as_json=as_json, **lookup)
+
+        return self.__as_json(as_json, result)
+
+    def upsert(self, conflict_fields: List[str], update_fields: Optional[List[str]] = None, as_json=True, **kwargs):
+        """
+        Creates instance or updates existing one with one query
+        INSERT ... ON CONFLICT DO UPDATE. Conflict fields should have unique constraint.
+
+        By default only passed fields, except conflict fields, are updated
+
+        Example:
+        MyModel.manager.upsert(conflict_fields=['email'], email='some@mail.com', name='some')
+        -> {'id': 1, 'email': 'some@mail.com', 'name': 'some'}
+        """
+        model = normalize_model(self._model)
+        fields = self.db_fields()
+        values = self.db_values(**kwargs)
+        safe_update_fields = [field for field in kwargs if field not in conflict_fields] \
+            if update_fields is None else update_fields
+
+        if not safe_update_fields:
+            return self.get_or_create(as_json=as_json, conflict_fields=conflict_fields, **kwargs)
+
+        sql = (
+            f'INSERT INTO "{model}" ({dump_fields(fields)}) VALUES ({binding(values)}) '
+            f'{self.__conflict(conflict_fields, safe_update_fields)} RETURNING *;'
+        )
+
+        cursor = self._lazy_query(sql, values)
+        result = serializer(cursor)
+        self._invalidate()
+
+        return self.__as_json(as_json, result, refresh=True)
+
+    def update_or_create(self, conflict_fields: List[str], update_fields: Optional[List[str]] = None, as_json=True,
+                         **kwargs):
+        """Same as ``upsert``"""
+        return self.upsert(conflict_fields, update_fields, as_json, **kwargs)
+
+    def upsert_many(self, rows: List[dict], conflict_fields: List[str], update_fields: Optional[List[str]] = None,
+                    batch_size: int = 1000, as_json=True):
+        """
+        Creates or updates multiple instances. Every batch is one query
+        INSERT ... VALUES (...), (...) ON CONFLICT ..., all batches are executed
+        in one transaction.
+
+        By default fields passed in rows, except conflict fields, are updated.
+        If there is nothing to update, conflicting rows are skipped and not returned.
+        Rows of one batch should not conflict with each other.
+
+        Example:
+        MyModel.manager.upsert_many(
+            [{'email': 'first@mail.com', 'name': 'first'}, {'email': 'second@mail.com', 'name': 'second'}],
+            conflict_fields=['email']
+        ) -> [{'id': 1, 'email': 'first@mail.com', 'name': 'first'}, {'id': 2, ...}]
+        """
+        if not rows:
+            return self.__as_json(as_json, [])
+
+        model = normalize_model(self._model)
+        fields = self.db_fields()
+        safe_update_fields = update_fields
+        if safe_update_fields is None:
+            passed = {field: None for row in rows for field in row}
+            safe_update_fields = [field for field in passed if field not in conflict_fields]
+
+        conflict = self.__conflict(conflict_fields, safe_update_fields)
+        bind = f'({binding(fields)})'
+
+        result = []
+        with self.atomic():
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                values = [value for row in batch for value in self.db_values(**row)]
+                sql = (
+                    f'INSERT INTO "{model}" ({dump_fields(fields)}) VALUES {", ".join([bind] * len(batch))} '
+                    f'{conflict} RETURNING *;'
+                )
+
+                cursor = self._lazy_query(sql, values)
+                result.extend(serializer(cursor, many=True))
+
+        self._invalidate()
+        return self.__as_json(as_json, result, refresh=True)
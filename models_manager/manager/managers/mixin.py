@@ -1,7 +1,7 @@
-from models_manager.manager.managers.database import DatabaseManager
+from models_manager.manager.managers.async_database import AsyncDatabaseManager
 from models_manager.manager.managers.json import JsonManager
 from models_manager.manager.managers.schema import SchemaManager
 
 
-class ManagerMixin(DatabaseManager, JsonManager, SchemaManager):
+class ManagerMixin(AsyncDatabaseManager, JsonManager, SchemaManager):
     pass
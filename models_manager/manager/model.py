@@ -9,6 +9,7 @@ from models_manager.manager.managers.mixin import ManagerMixin
 class Config:
     exclude_fields: List[str]
     additional_properties: bool
+    cache_ttl: float
 
 
 class Meta(type):
@@ -84,6 +85,9 @@ class Meta(type):
                 "schema_additional_properties": config.additional_properties,
             }
 
+        if hasattr(config, "cache_ttl"):
+            attrs = {**attrs, "database_cache_ttl": config.cache_ttl}
+
         return attrs
 
 
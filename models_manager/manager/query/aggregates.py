@@ -0,0 +1,72 @@
+from typing import Dict, Optional
+
+
+class Aggregate:
+    """
+    SQL aggregate function, which is used with ``aggregate`` and ``annotate``.
+
+    Default alias is "<field>__<function>", for example "amount__sum". For
+    ``Count('*')`` default alias is "count"
+
+    Example:
+        Sum('amount').to_sql('payment') -> 'SUM("payment"."amount")'
+        Count('user_id', distinct=True).to_sql('payment') -> 'COUNT(DISTINCT "payment"."user_id")'
+    """
+    function: str = None
+
+    def __init__(self, field: str, distinct: bool = False):
+        self.field = field
+        self.distinct = distinct
+
+    @property
+    def default_alias(self) -> str:
+        if self.field == '*':
+            return self.function.lower()
+
+        return f'{self.field}__{self.function.lower()}'
+
+    def to_sql(self, model: str) -> str:
+        column = '*' if self.field == '*' else f'"{model}"."{self.field}"'
+        distinct = 'DISTINCT ' if self.distinct else ''
+        return f'{self.function}({distinct}{column})'
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.field!r})'
+
+
+class Sum(Aggregate):
+    function = 'SUM'
+
+
+class Count(Aggregate):
+    function = 'COUNT'
+
+
+class Avg(Aggregate):
+    function = 'AVG'
+
+
+class Min(Aggregate):
+    function = 'MIN'
+
+
+class Max(Aggregate):
+    function = 'MAX'
+
+
+def get_aggregates(model: str, *args: Aggregate, **kwargs: Aggregate) -> Optional[str]:
+    """
+    Builds select list from aggregates. Positional aggregates
+    get default alias, keyword aggregates are aliased with the key
+
+    Example:
+        get_aggregates('payment', Sum('amount'), total=Count('*'))
+        -> 'SUM("payment"."amount") AS "amount__sum", COUNT(*) AS "total"'
+    """
+    aggregates: Dict[str, Aggregate] = {aggregate.default_alias: aggregate for aggregate in args}
+    aggregates.update(kwargs)
+
+    if not aggregates:
+        return None
+
+    return ', '.join([f'{aggregate.to_sql(model)} AS "{alias}"' for alias, aggregate in aggregates.items()])
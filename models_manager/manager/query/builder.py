@@ -1,55 +1,150 @@
-from typing import Union
+from functools import lru_cache
+from typing import Tuple, Union
 
 from models_manager.manager.query.operators import SupportedOperators
-from models_manager.utils import dump_value
+from models_manager.manager.query.params import ArrayParam
 
 MODEL_MOCK = '{model}'
 SUPPORTED_VALUES = Union[str, list, tuple, int, float]
+Shape = Tuple[str, bool, tuple]
 TEMPLATES = SupportedOperators.to_list()
+SUFFIXES = dict(TEMPLATES)
+ARRAY_TEMPLATES = (SupportedOperators.IN.value[0], SupportedOperators.NOT_IN.value[0])
 
 
-def template_to_query(name: str, value: SUPPORTED_VALUES):
+def to_array_param(value) -> ArrayParam:
+    """Single value is used as array with one element"""
+    if isinstance(value, (str, bytes)) or not hasattr(value, '__iter__'):
+        return ArrayParam((value,))
+
+    return ArrayParam(value)
+
+
+@lru_cache(maxsize=4096)
+def parse_lookup(name: str) -> Tuple[str, str, str]:
+    """
+    Splits lookup into column, template and SQL operator. Only the last
+    "__" part is looked up in the table of templates, so column name
+    is never changed
+
+    Example:
+        >>> parse_lookup('id__in')
+        ('id', '__in', '= ANY')
+        >>> parse_lookup('name')
+        ('name', '', '=')
+        >>> parse_lookup('created__lt__lt')
+        ('created__lt', '__lt', '<')
+    """
+    column, separator, suffix = name.rpartition('__')
+    template = f'__{suffix}'
+    if column and template in SUFFIXES:
+        return column, template, SUFFIXES[template]
+
+    return name, '', '='
+
+
+@lru_cache(maxsize=4096)
+def lookup_to_query(name: str) -> str:
+    """
+    Example:
+        >>> lookup_to_query('id__in')
+        '"{model}"."id" = ANY(%s)'
+    """
+    column, template, operator = parse_lookup(name)
+    if template in ARRAY_TEMPLATES:
+        return f'"{MODEL_MOCK}"."{column}" {operator}(%s)'
+
+    return f'"{MODEL_MOCK}"."{column}" {operator} %s'
+
+
+def lookup_param(name: str, value: SUPPORTED_VALUES):
+    """Values of ``__in`` and ``__not_in`` are sent as one array parameter"""
+    if parse_lookup(name)[1] in ARRAY_TEMPLATES:
+        return to_array_param(value)
+
+    return value
+
+
+def template_to_query(name: str, value: SUPPORTED_VALUES) -> Tuple[str, tuple]:
     """
     :param name: Template name of the field, for example ``id__in``
     :param value: Value of the field for matching the condition
-    :return: Will return part of the SQL query
+    :return: Will return part of the SQL query and its parameters. Values of
+    ``__in`` and ``__not_in`` are sent as one array parameter, so query text
+    does not depend on number of values
 
     Example:
         >>> template_to_query('id__in', (1, 2, 3))
-        '"{model}"."id" IN (1, 2, 3)'
+        ('"{model}"."id" = ANY(%s)', ((1, 2, 3),))
         >>> template_to_query('name', 5)
-        '"{model}"."name" = 5'
+        ('"{model}"."name" = %s', (5,))
         >>> template_to_query('name__not_in', (1, 2, 3))
-        '"{model}"."name" NOT IN (1, 2, 3)'
+        ('"{model}"."name" <> ALL(%s)', ((1, 2, 3),))
+    """
+    return lookup_to_query(name), (lookup_param(name, value),)
+
+
+@lru_cache(maxsize=1024)
+def shape_to_query(shape: Shape) -> str:
+    """
+    Example:
+        >>> shape_to_query(('OR', True, ('id__in', ('AND', False, ('name', 'email')))))
+        'NOT ("{model}"."id" = ANY(%s) OR ("{model}"."name" = %s AND "{model}"."email" = %s))'
+    """
+    default, negated, operands = shape
+    parts = []
+    for operand in operands:
+        if isinstance(operand, str):
+            parts.append(lookup_to_query(operand))
+        elif len(operand[2]) > 1 and not operand[1]:
+            parts.append(f'({shape_to_query(operand)})')
+        else:
+            parts.append(shape_to_query(operand))
+
+    query = f' {default} '.join(parts)
+    if negated and query:
+        return f'NOT ({query})'
+
+    return query
+
+
+@lru_cache(maxsize=1024)
+def compile_query(model: str, keys: Tuple[str, ...], shapes: tuple) -> str:
+    """
+    Builds query for model from lookups and shapes of Q nodes.
+    Query is cached, so repeated filters with the same fields
+    are built once
+
+    Example:
+        >>> compile_query('user', ('id__in', 'name'), ())
+        '"user"."id" = ANY(%s) AND "user"."name" = %s'
     """
-    template, operator = next(filter(lambda t: name.endswith(t[0]), TEMPLATES), ('', '='))
-    name = name.replace(template, '')
+    parts = [lookup_to_query(key) for key in keys]
+    node_parts = [shape_to_query(shape) for shape in shapes]
 
-    return f'"{MODEL_MOCK}"."{name}" {operator} {dump_value(value)}'
+    # node query is wrapped with brackets, so its OR is not mixed with joining AND
+    if parts or len(node_parts) > 1:
+        node_parts = [f'({part})' for part in node_parts]
 
+    # replacing model name mock with real model name
+    return ' AND '.join([*parts, *node_parts]).replace(MODEL_MOCK, model)
 
-def get_query(model: str, *args, **kwargs) -> str:
+
+def get_query(model: str, *args, **kwargs) -> Tuple[str, tuple]:
     """
     :param model: Normalized name of the model
     :param args: Node Q arguments | MyModel.manager.filter(Q(name__in=(1, 2, 3)))
     :param kwargs: Keyword arguments for query | MyModel.manager.filter(name__in=(1, 2, 3))
-    :return:
+    :return: Query and its parameters, which should be passed to the cursor together
+
+    Query text depends only on model, names of kwargs and shapes of nodes,
+    so it is taken from cache, and only parameters are collected on every call
     """
     # simple query - MyModel.manager.filter(name__in=(1, 2, 3))
     # node query -  MyModel.manager.filter(Q(name__in=(1, 2, 3)))
+    params = [lookup_param(key, value) for key, value in kwargs.items()]
 
-    # resolving query for passed nodes
-    # Every Q object should have .defined_query attribute, but if this attribute is
-    # None, then we are getting query of this node by our self .to_query()
-    node_query = ' AND '.join([node.defined_query or node.to_query() for node in args])
-
-    # resolving query for simple query
-    simple_query = ' AND '.join([template_to_query(key, value) for key, value in kwargs.items()])
-
-    # if user passed simple query and node query
-    if simple_query and node_query:
-        # then we are joining them with AND operator. And replacing model name mock with real model name
-        return f'{simple_query} AND {node_query}'.replace(MODEL_MOCK, model)
+    # every node is compiled once here, parameters are collected in order of the query
+    shapes = tuple(shape for shape in (node._compile(params) for node in args) if shape[2])
 
-    # if only one query was passed, then getting this query. And replacing model name mock with real model name
-    return (simple_query or node_query).replace(MODEL_MOCK, model)
+    return compile_query(model, tuple(kwargs), shapes), tuple(params)
@@ -0,0 +1,97 @@
+import math
+from array import array
+from typing import Any, Dict, Optional, Sequence, Union
+
+from models_manager.manager.field.adapters import category_origin
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TYPECODES = {bool: 'b', int: 'q', float: 'd'}
+NUMPY_DTYPES = {'b': 'bool', 'q': 'int64', 'd': 'float64'}
+
+Column = Union[array, list, Any]
+
+
+def column_typecode(category) -> Optional[str]:
+    """
+    Typecode of ``array.array`` for values of the category,
+    None if values can not be stored in typed array
+
+    Example:
+        >>> column_typecode(int), column_typecode(float), column_typecode(str)
+        ('q', 'd', None)
+    """
+    return TYPECODES.get(category_origin(category))
+
+
+class ColumnBuilder:
+    """
+    Collects values of one column chunk by chunk into typed ``array.array``.
+
+    Integer column with NULL becomes float column with NaN, same as in pandas.
+    If values do not fit into typed array, for example NULL in bool column,
+    then column falls back to list
+    """
+
+    def __init__(self, typecode: Optional[str]):
+        self.values: Union[array, list] = array(typecode) if typecode else []
+
+    def extend(self, values: Sequence):
+        if isinstance(self.values, list):
+            self.values.extend(values)
+            return
+
+        if self.values.typecode in ('q', 'd') and None in values:
+            if self.values.typecode == 'q':
+                self.values = array('d', self.values)
+
+            values = [math.nan if value is None else value for value in values]
+
+        size = len(self.values)
+        try:
+            self.values.extend(values)
+        except (TypeError, OverflowError):
+            # extend of array is not atomic, values before failed one are already added
+            previous = self.values[:size].tolist()
+            if self.values.typecode == 'b':
+                previous = [bool(value) for value in previous]
+
+            self.values = [*previous, *values]
+
+    def build(self, as_numpy: bool) -> Column:
+        if not as_numpy:
+            return self.values
+
+        if isinstance(self.values, list):
+            column = numpy.empty(len(self.values), dtype=object)
+            column[:] = self.values
+            return column
+
+        return numpy.frombuffer(self.values, dtype=NUMPY_DTYPES[self.values.typecode])
+
+
+def fetch_columns(cursor, fields: Sequence[str], typecodes: Sequence[Optional[str]],
+                  chunk_size: int) -> Dict[str, Column]:
+    """
+    Reads rows of executed query with ``fetchmany`` and fills one column per field.
+    Columns are NumPy arrays if NumPy is installed, otherwise ``array.array``
+    for numeric columns and lists for other columns
+    """
+    builders = [ColumnBuilder(typecode) for typecode in typecodes]
+
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+
+        for builder, values in zip(builders, zip(*rows)):
+            builder.extend(values)
+
+        if len(rows) < chunk_size:
+            break
+
+    as_numpy = numpy is not None
+    return {field: builder.build(as_numpy) for field, builder in zip(fields, builders)}
@@ -0,0 +1,114 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Union
+
+EXPLAIN_FORMATS = ('json', 'text', 'xml', 'yaml')
+SEQ_SCAN_ROWS = 10000
+ESTIMATE_RATIO = 10.0
+RELATION_ROWS_SQL = 'SELECT "relname", "reltuples" FROM "pg_class" WHERE "relname" = ANY(%s) AND "relkind" = \'r\''
+
+
+class QueryPlan(NamedTuple):
+    """
+    Result of EXPLAIN.
+
+    :param sql: Query, which was explained
+    :param plan: Parsed plan for "json" format, text of the plan for other formats
+    :param warnings: Problems found in the plan, only for "json" format
+    """
+    sql: str
+    plan: Union[dict, str]
+    warnings: List[str]
+
+    def nodes(self) -> Iterator[dict]:
+        """All nodes of the plan, starting from the root"""
+        if not isinstance(self.plan, dict):
+            return
+
+        stack = [self.plan['Plan']]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.get('Plans', [])))
+
+
+def explain_options(analyze: bool, buffers: bool, format: str) -> str:
+    """
+    Example:
+        >>> explain_options(True, False, 'json')
+        'ANALYZE true, BUFFERS false, FORMAT JSON'
+    """
+    return f'ANALYZE {str(analyze).lower()}, BUFFERS {str(buffers).lower()}, FORMAT {format.upper()}'
+
+
+def node_name(node: dict) -> str:
+    """
+    Example:
+        >>> node_name({'Node Type': 'Seq Scan', 'Relation Name': 'user'})
+        'Seq Scan on "user"'
+        >>> node_name({'Node Type': 'Sort', 'Sort Key': ['"user"."id"']})
+        'Sort by "user"."id"'
+    """
+    if 'Relation Name' in node:
+        return f'{node["Node Type"]} on "{node["Relation Name"]}"'
+
+    if 'Sort Key' in node:
+        return f'{node["Node Type"]} by {", ".join(node["Sort Key"])}'
+
+    return node['Node Type']
+
+
+def estimated_scans(plan: QueryPlan) -> Set[str]:
+    """Tables of sequential scans, which were not executed, their size is taken from statistics"""
+    return {
+        node['Relation Name'] for node in plan.nodes()
+        if node['Node Type'] == 'Seq Scan' and 'Actual Rows' not in node and 'Relation Name' in node
+    }
+
+
+def scanned_rows(node: dict, relation_rows: Optional[Dict[str, float]] = None) -> float:
+    """
+    Number of rows read by the node. Without ANALYZE "Plan Rows" is number
+    of rows after filter, so sequential scan reads estimated number of rows
+    in the table, which is taken from ``relation_rows``
+
+    Example:
+        >>> scanned_rows({'Node Type': 'Seq Scan', 'Relation Name': 'user', 'Plan Rows': 1}, {'user': 50000.0})
+        50000.0
+    """
+    if 'Actual Rows' not in node:
+        table_rows = (relation_rows or {}).get(node.get('Relation Name'), 0)
+        return max(node.get('Plan Rows', 0), table_rows)
+
+    rows = node['Actual Rows'] + node.get('Rows Removed by Filter', 0)
+    return rows * node.get('Actual Loops', 1)
+
+
+def plan_warnings(plan: QueryPlan, seq_scan_rows: int = SEQ_SCAN_ROWS, estimate_ratio: float = ESTIMATE_RATIO,
+                  relation_rows: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    Finds nodes of the plan, which usually mean slow query:
+    - sequential scan, which reads more than ``seq_scan_rows`` rows. Without ANALYZE
+    number of rows in the table is taken from ``relation_rows``, see ``RELATION_ROWS_SQL``
+    - estimated number of rows differs from actual one more than ``estimate_ratio`` times,
+    usually means outdated statistics. Only with ANALYZE
+    - sort, which does not fit into work_mem and uses disk. Only with ANALYZE
+    """
+    warnings = []
+    for node in plan.nodes():
+        name = node_name(node)
+
+        rows = scanned_rows(node, relation_rows)
+        if node['Node Type'] == 'Seq Scan' and rows >= seq_scan_rows:
+            warnings.append(f'{name} reads {rows:.0f} rows, index may be missing')
+
+        if 'Actual Rows' in node:
+            estimated, actual = node.get('Plan Rows', 0), node['Actual Rows']
+            ratio = max(estimated, actual) / max(min(estimated, actual), 1)
+            if ratio >= estimate_ratio:
+                warnings.append(
+                    f'{name} estimated {estimated} rows, actual {actual} rows, statistics may be outdated'
+                )
+
+        if node.get('Sort Space Type') == 'Disk':
+            warnings.append(f'{name} spilled to disk ({node.get("Sort Space Used")} kB), increase work_mem')
+
+    return warnings
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import Iterator, List, Tuple, Union
 
-from models_manager.manager.query.builder import template_to_query
+from models_manager.manager.query.builder import Shape, lookup_param, shape_to_query
 
 
 class Q:
@@ -8,11 +8,15 @@ class Q:
     Class which implements interface for making complicated queries
     using bitwise operators
 
-    Currently supported only &, | operators
+    Supported &, | and ~ operators. Q is expression tree, operators do not
+    build query, they only make new node. Query is compiled once, when it is
+    executed, and nested nodes with the same operator are joined into one
+    group, so Q(a=1) | Q(b=2) | Q(c=3) is compiled without nested brackets
 
     Example:
         MyModel.manager.filter(Q(name_in=('some', 'other') | Q(id__in=(1, 2, 3))))
         MyModel.manager.filter(Q(name_in=('some', 'other') & Q(id__in=(1, 2, 3))))
+        MyModel.manager.filter(~Q(name='some'))
         MyModel.manager.filter(
             Q(name_in=('some', 'other')) &
             Q(id__in=(1, 2, 3)) |
@@ -23,41 +27,70 @@ class Q:
     OR = 'OR'
     default = AND
 
-    def __init__(self, defined_query: Optional[str] = None, default=AND, **kwargs):
-        self._query = kwargs
-        self._defined_query = defined_query
+    def __init__(self, default=AND, **kwargs):
         self.default = default
+        self.negated = False
+        self.children: List[Union['Q', Tuple[str, object]]] = list(kwargs.items())
 
-    @property
-    def defined_query(self):
-        return self._defined_query
+    @classmethod
+    def _node(cls, children: list, default: str, negated: bool = False) -> 'Q':
+        node = cls(default=default)
+        node.children = children
+        node.negated = negated
+        return node
 
-    def to_query(self) -> str:
-        """Used to convert dict of passed template fields to the SQL query string"""
-        return f' {self.default} '.join([template_to_query(key, value) for key, value in self._query.items()])
+    def __and__(self, other: 'Q') -> 'Q':
+        return self._node([self, other], self.AND)
 
-    def resolve_query(self, node: Optional['Q'], operator: str):
-        """
-        Used to resolve query for operators
+    def __or__(self, other: 'Q') -> 'Q':
+        return self._node([self, other], self.OR)
 
-        If ``_defined_query`` is None, then we are going to calculate the query for
-        current object and for other Q object query.
+    def __invert__(self) -> 'Q':
+        return self._node(self.children, self.default, not self.negated)
 
-        If ``_defined_query`` is not None, then we are getting cached ``_defined_query`` and
-        joinigng it with other Q object query.
+    def _operands(self) -> Iterator[Union['Q', Tuple[str, object]]]:
+        """
+        Children of the node, where children nodes with the same operator
+        are replaced with their own children. Made without recursion, so long
+        chains like Q(...) | Q(...) | ... are walked in linear time
         """
-        if self._defined_query is None:
-            self_query, other_query = self.to_query(), node.to_query()
-            self._defined_query = f'({self_query}) {operator} ({other_query})'
-            return Q(defined_query=self._defined_query)
-        else:
-            return Q(defined_query=f'({self._defined_query}) {operator} ({node.to_query()})')
+        stack = list(reversed(self.children))
+        while stack:
+            child = stack.pop()
+            if not isinstance(child, Q):
+                yield child
+            elif not child.negated and (child.default == self.default or len(child.children) <= 1):
+                stack.extend(reversed(child.children))
+            else:
+                yield child
+
+    def _compile(self, params: list) -> Shape:
+        """Returns shape of the node and collects parameters in order of the query"""
+        operands = []
+        for operand in self._operands():
+            if isinstance(operand, Q):
+                shape = operand._compile(params)
+                if shape[2]:
+                    operands.append(shape)
+            else:
+                key, value = operand
+                operands.append(key)
+                params.append(lookup_param(key, value))
 
-    def __and__(self, other: 'Q'):
-        return self.resolve_query(other, self.AND)
+        return self.default, self.negated, tuple(operands)
 
-    def __or__(self, other: 'Q'):
-        return self.resolve_query(other, self.OR)
+    def to_query(self) -> Tuple[str, tuple]:
+        """
+        Used to convert the node to the SQL query string and its parameters.
+        Query is cached per shape of the tree, so nodes with the same fields
+        and operators, but different values, share one compiled query
+        """
+        params = []
+        shape = self._compile(params)
+        return shape_to_query(shape), tuple(params)
 
     def __str__(self):
-        return self.defined_query or self.to_query()
+        return self.to_query()[0]
+
+    def __repr__(self):
+        return f'<Q: {self}>'
@@ -13,8 +13,8 @@ class SupportedOperators(Enum):
         Also can be used inside Q chain
         MyModel.manager.filter(Q(name__in=('some', 'other')) | Q(name='some'))
     """
-    IN = '__in', 'IN'
-    NOT_IN = '__not_in', 'NOT IN'
+    IN = '__in', '= ANY'
+    NOT_IN = '__not_in', '<> ALL'
     NOT_EQUAL = '__not_equal', '!='
     LT = '__lt', '<'
     LE = '__le', '<='
@@ -0,0 +1,54 @@
+from typing import Any
+
+
+class ArrayParam(tuple):
+    """
+    Query parameter, which is sent as one array value. Used with
+    ``= ANY(%s)`` and ``<> ALL(%s)``, so query text does not depend
+    on number of values.
+
+    Array is sent as untyped literal, for example '{"1","2"}', so the
+    database takes element type from the compared column. This way same
+    parameter works for integer, text, uuid and date columns.
+
+    Example:
+        >>> to_array_literal(ArrayParam([1, 'some "quoted"', None]))
+        '{"1","some \\\\"quoted\\\\"",NULL}'
+    """
+    pass
+
+
+def to_array_element(value: Any) -> str:
+    if value is None:
+        return 'NULL'
+
+    if isinstance(value, bool):
+        value = 'true' if value else 'false'
+
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def to_array_literal(values: ArrayParam) -> str:
+    return '{' + ','.join([to_array_element(value) for value in values]) + '}'
+
+
+class JsonParam:
+    """
+    Query parameter, which is sent as JSON document. Dict and list values
+    of fields are wrapped with it, so every backend can bind them: psycopg2
+    sends it as json literal and sqlite3 as text.
+
+    Example:
+        JsonParam({'key': 'value'}) -> '{"key": "value"}'
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, JsonParam) and self.value == other.value
+
+    def __repr__(self):
+        return f'JsonParam({self.value!r})'
@@ -1,8 +1,17 @@
+import json
 import logging
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from models_manager.manager.exceptions import ModelOperationError, QuerySetOperationError
+from models_manager.manager.query.aggregates import Aggregate, get_aggregates
 from models_manager.manager.query.builder import get_query
-from models_manager.utils import serializer, normalize_model, binding, dump_value
+from models_manager.manager.query.columns import Column, column_typecode, fetch_columns
+from models_manager.manager.query.explain import (
+    EXPLAIN_FORMATS, RELATION_ROWS_SQL, QueryPlan, estimated_scans, explain_options, plan_warnings
+)
+from models_manager.manager.query.params import ArrayParam
+from models_manager.manager.session import Session
+from models_manager.utils import serializer, normalize_model, to_snake_case
 
 
 class QuerySet:
@@ -17,17 +26,64 @@ class QuerySet:
     result = MyModel.manager.filter(name='some', as_json=False) -> QuerySet([...instances...])
     result.update(name='other') -> QuerySet([...instances...])
     result.delete() -> None
+
+    QuerySet created with ``instances=None`` is lazy. Rows will be fetched
+    only on first access to instances, and ``where`` will be used as query
     """
 
-    def __init__(self, model, identity, query, mro, instances, manager):
+    def __init__(self, model, identity, query, mro, instances, manager, where: Optional[str] = None,
+                 params: tuple = ()):
         self._model = model
         self._mro = mro
-        self._instances = instances
+        self._result = instances
         self._identity = identity
         self._query = query
         self._manager = manager
+        self._where = where
+        self._params = params
 
         self._index = 0
+        self._group_by: Tuple[str, ...] = ()
+
+    @property
+    def _instances(self) -> list:
+        """Returns instances and fetches them if QuerySet is lazy"""
+        if self._result is None:
+            rows = self._manager._select(self.__select('*'), self._params, many=True)
+            self._result = [self._manager._to_instance(row) for row in rows]
+
+        return self._result
+
+    @property
+    def is_fetched(self) -> bool:
+        """Return True if instances already loaded from database"""
+        return self._result is not None
+
+    def __select(self, columns: str) -> str:
+        """Builds select query for lazy QuerySet"""
+        model = normalize_model(self._model)
+        sql = f'SELECT {columns} FROM "{model}"'
+
+        if self._where:
+            sql += f' WHERE {self._where}'
+
+        return sql
+
+    def __scope(self, columns: str) -> Tuple[str, tuple]:
+        """
+        Builds select query, which is restricted to rows of QuerySet.
+        Lazy QuerySet uses own where clause, fetched QuerySet uses identities
+        of fetched instances
+        """
+        if not self.is_fetched:
+            return self.__select(columns), self._params
+
+        model = normalize_model(self._model)
+        sql = f'SELECT {columns} FROM "{model}"'
+        if not self._result:
+            return f'{sql} WHERE FALSE', ()
+
+        return f'{sql} WHERE "{model}"."{self._identity}" = ANY(%s)', (ArrayParam(self.__map_to_identity),)
 
     def __str__(self):
         objects = ', '.join([str(instance) for instance in self._instances])
@@ -44,6 +100,21 @@ class QuerySet:
         self._index += 1
         return result
 
+    async def __aiter__(self):
+        """
+        Async iteration, rows of lazy QuerySet are fetched
+        without blocking of event loop
+
+        Example:
+            async for user in User.manager.filter(as_json=False):
+                ...
+        """
+        if not self.is_fetched:
+            await self._manager._in_executor(lambda: self._instances)
+
+        for instance in self._instances:
+            yield instance
+
     def __len__(self):
         return len(self._instances)
 
@@ -62,19 +133,247 @@ class QuerySet:
             )
 
     def __as_query_set(self, as_query_set: bool, result):
-        """Return QuerySet either dict depends on as_query_set option"""
+        """
+        Return QuerySet either dict depends on as_query_set option.
+        Objects of the current session are refreshed from rows in both cases
+        """
         if not as_query_set:
+            session = Session.current()
+            if session is None:
+                return result
+
+            for row in result:
+                if session.get(self._manager._identity_key(row.get(self._identity))) is not None:
+                    self._manager._to_instance(row, refresh=True)
+
             return result
 
-        instances = [
-            type(self._model, self._mro, {**self._manager.__dict__, **(row or {})})()
-            for row in result
-        ]
+        instances = [self._manager._to_instance(row, refresh=True) for row in result]
         return QuerySet(self._model, self._identity, self._query, self._mro, instances, self._manager)
 
+    def prefetch_related(self, field: str, model, to_attr: Optional[str] = None,
+                         related_field: Optional[str] = None) -> 'QuerySet':
+        """
+        Loads related objects for all instances with one query.
+
+        :param field: Related field of the QuerySet model, usually marked with is_related=True
+        :param model: Related model class
+        :param to_attr: Attribute of instances for related object, by default snake case name of the model
+        :param related_field: Unique field of related model, by default identity of the model
+        :return: Same QuerySet, related objects are set to instances. If related object does not
+        exist, then None is set
+
+        Example:
+            class Project(Model):
+                identity = 'id'
+                id = Field(category=int)
+
+            class Task(Model):
+                identity = 'id'
+                id = Field(category=int)
+                project_id = Field(category=int, is_related=True)
+
+            tasks = Task.manager.filter(as_json=False).prefetch_related('project_id', model=Project)
+            tasks[0].project -> <Project 1>
+
+            It will make 2 queries:
+            SELECT * FROM "task";
+            SELECT * FROM "project" WHERE "project"."id" = ANY('{1,2}');
+        """
+        safe_to_attr = to_attr or to_snake_case(model.__name__)
+        ids = {getattr(instance, field).raw_value for instance in self._instances}
+        ids.discard(None)
+
+        related = model.manager.in_bulk(ids, as_json=False, field=related_field) if ids else {}
+        for instance in self._instances:
+            setattr(instance, safe_to_attr, related.get(getattr(instance, field).raw_value))
+
+        return self
+
+    def aggregate(self, *args: Aggregate, **kwargs: Aggregate) -> dict:
+        """
+        Calculates aggregates on the database side and returns one dict.
+        Rows of QuerySet are not fetched
+
+        Example:
+            payments = Payment.manager.filter(status='paid', as_json=False)
+            payments.aggregate(Sum('amount'), total=Count('*')) -> {'amount__sum': 300, 'total': 2}
+
+            SELECT SUM("payment"."amount") AS "amount__sum", COUNT(*) AS "total"
+            FROM "payment" WHERE "payment"."status" = 'paid';
+        """
+        model = normalize_model(self._model)
+        columns = get_aggregates(model, *args, **kwargs)
+        if columns is None:
+            raise QuerySetOperationError(
+                'You should provide at least one aggregate. '
+                'Example .aggregate(Sum("amount"))'
+            )
+
+        sql, values = self.__scope(columns)
+        return self._manager._select(sql, values)
+
+    def group_by(self, *fields: str) -> 'QuerySet':
+        """
+        Returns copy of QuerySet grouped by fields, should be used with ``annotate``
+
+        Example:
+            Payment.manager.filter(as_json=False).group_by('status').annotate(Sum('amount'))
+        """
+        if not fields:
+            raise QuerySetOperationError(
+                'You should provide at least one field to group by. '
+                'Example .group_by("status")'
+            )
+
+        query_set = QuerySet(self._model, self._identity, self._query, self._mro, self._result, self._manager,
+                             where=self._where, params=self._params)
+        query_set._group_by = fields
+        return query_set
+
+    def annotate(self, *args: Aggregate, **kwargs: Aggregate) -> List[dict]:
+        """
+        Calculates aggregates per group, one dict is returned for every group
+
+        Example:
+            payments = Payment.manager.filter(as_json=False)
+            payments.group_by('status').annotate(Sum('amount'), Count('*')) -> [
+                {'status': 'paid', 'amount__sum': 300, 'count': 2},
+                {'status': 'new', 'amount__sum': 100, 'count': 1}
+            ]
+
+            SELECT "payment"."status", SUM("payment"."amount") AS "amount__sum", COUNT(*) AS "count"
+            FROM "payment" GROUP BY "payment"."status";
+        """
+        if not self._group_by:
+            raise QuerySetOperationError(
+                'QuerySet is not grouped, annotate should be used after group_by. '
+                'Example .group_by("status").annotate(Count("*"))'
+            )
+
+        model = normalize_model(self._model)
+        aggregates = get_aggregates(model, *args, **kwargs)
+        group_by = ', '.join([f'"{model}"."{field}"' for field in self._group_by])
+        columns = f'{group_by}, {aggregates}' if aggregates else group_by
+
+        sql, values = self.__scope(columns)
+        return self._manager._select(f'{sql} GROUP BY {group_by}', values, many=True)
+
+    def distinct(self, *fields: str) -> List[dict]:
+        """
+        Returns distinct values of fields, rows of QuerySet are not fetched
+
+        Example:
+            Payment.manager.filter(as_json=False).distinct('status') -> [{'status': 'paid'}, {'status': 'new'}]
+
+            SELECT DISTINCT "payment"."status" FROM "payment";
+        """
+        model = normalize_model(self._model)
+        columns = ', '.join([f'"{model}"."{field}"' for field in fields]) or '*'
+
+        sql, values = self.__scope(f'DISTINCT {columns}')
+        return self._manager._select(sql, values, many=True)
+
+    def explain(self, analyze: bool = False, buffers: bool = False, format: str = 'json') -> QueryPlan:
+        """
+        Runs EXPLAIN for query of the QuerySet. Rows of QuerySet are not fetched
+
+        :param analyze: Execute query and show actual time and number of rows
+        :param buffers: Show usage of buffers, more useful with analyze=True
+        :param format: Format of the plan, one of "json", "text", "xml", "yaml"
+        :return: Plan, for "json" format the plan is parsed and checked for sequential
+        scans on big tables, wrong estimates of rows and sorts spilled to disk
+
+        Example:
+            plan = User.manager.filter(username='some', as_json=False).explain(analyze=True)
+            plan.plan -> {'Plan': {'Node Type': 'Seq Scan', 'Relation Name': 'user', ...}, 'Execution Time': 10.1}
+            plan.warnings -> ['Seq Scan on "user" reads 100000 rows, index may be missing']
+
+            EXPLAIN (ANALYZE true, BUFFERS false, FORMAT JSON) SELECT * FROM "user" WHERE "user"."username" = 'some';
+        """
+        if not self._manager._backend.supports_explain:
+            raise QuerySetOperationError(f'Backend "{self._manager._backend.name}" does not support explain')
+
+        if format not in EXPLAIN_FORMATS:
+            raise QuerySetOperationError(f'Format "{format}" is not supported, use one of {EXPLAIN_FORMATS}')
+
+        sql, values = self.__scope('*')
+        cursor = self._manager._lazy_query(f'EXPLAIN ({explain_options(analyze, buffers, format)}) {sql}', values)
+        rows = cursor.fetchall()
+
+        if format != 'json':
+            return QueryPlan(sql, '\n'.join([row[0] for row in rows]), [])
+
+        plan = rows[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        result = QueryPlan(sql, plan[0], [])
+        result.warnings.extend(plan_warnings(result, relation_rows=self.__relation_rows(result)))
+        return result
+
+    def __relation_rows(self, plan: QueryPlan) -> Dict[str, float]:
+        """Estimated number of rows in tables, which are scanned sequentially in not executed plan"""
+        tables = estimated_scans(plan)
+        if not tables:
+            return {}
+
+        rows = self._manager._select(RELATION_ROWS_SQL, (ArrayParam(sorted(tables)),), many=True)
+        relation_rows: Dict[str, float] = {}
+        for row in rows:
+            relation_rows[row['relname']] = max(relation_rows.get(row['relname'], 0), row['reltuples'])
+
+        return relation_rows
+
+    def to_columns(self, fields: Optional[Sequence[str]] = None, chunk_size: int = 10000) -> Dict[str, Column]:
+        """
+        Fetches rows of QuerySet in chunks into one typed column per field,
+        instances and dicts are not created. Type of column is taken from
+        category of the field: int, float and bool fields are NumPy arrays
+        with int64, float64 and bool dtype if NumPy is installed, otherwise
+        ``array.array``. Other fields are object arrays either lists.
+        NULL in int field turns the column into float column with NaN
+
+        :param fields: Fields to fetch, all database fields by default
+        :param chunk_size: Number of rows, which are fetched at once
+
+        Example:
+            columns = Payment.manager.filter(status='paid', as_json=False).to_columns(['user_id', 'amount'])
+            columns['amount'].sum() -> 300.0
+            numpy.bincount(columns['user_id']) -> array([0, 2, 1])
+
+            SELECT "payment"."user_id", "payment"."amount" FROM "payment" WHERE "payment"."status" = %s;
+        """
+        fields = list(fields or self._manager.db_fields())
+        if not fields:
+            raise QuerySetOperationError(
+                'You should provide at least one field. '
+                'Example .to_columns(["amount"])'
+            )
+
+        model = normalize_model(self._model)
+        model_fields = self._manager._fields_as_original()
+        typecodes = [
+            column_typecode(model_fields[field].category) if field in model_fields else None
+            for field in fields
+        ]
+
+        sql, values = self.__scope(', '.join([f'"{model}"."{field}"' for field in fields]))
+        cursor = self._manager._lazy_query(sql, values)
+        return fetch_columns(cursor, fields, typecodes, chunk_size)
+
     def count(self) -> int:
-        """Return number of instances in QuerySet"""
-        return len(self._instances)
+        """
+        Return number of instances in QuerySet.
+
+        If QuerySet is lazy, then ``SELECT COUNT(*)`` will be executed,
+        instead of fetching all rows
+        """
+        if self.is_fetched:
+            return len(self._result)
+
+        cursor = self._manager._lazy_query(self.__select('COUNT(*)'), self._params)
+        return cursor.fetchone()[0]
 
     def delete(self):
         """
@@ -90,9 +389,14 @@ class QuerySet:
             return
 
         model = normalize_model(self._model)
-        bind = binding(self._instances)
-        sql = f'DELETE FROM "{model}" WHERE "{model}"."{self._identity}" IN ({bind});'
-        self._query(sql, self.__map_to_identity)
+        sql = f'DELETE FROM "{model}" WHERE "{model}"."{self._identity}" = ANY(%s);'
+        self._manager._lazy_query(sql, (ArrayParam(self.__map_to_identity),))
+        self._manager._invalidate()
+
+        session = Session.current()
+        if session is not None:
+            for identity in self.__map_to_identity:
+                session.remove(self._manager._identity_key(identity))
 
     def update(self, as_query_set: bool = False, **kwargs):
         """
@@ -116,13 +420,15 @@ class QuerySet:
             )
 
         model = normalize_model(self._model)
-        bind = binding(self._instances)
-        values = ', '.join([f'"{key}" = {dump_value(value)}' for key, value in kwargs.items()])
+        values = ', '.join([f'"{key}" = %s' for key in kwargs])
 
-        sql = f'UPDATE "{model}" SET {values} WHERE "{model}"."{self._identity}" IN ({bind}) RETURNING*;'
+        sql = f'UPDATE "{model}" SET {values} WHERE "{model}"."{self._identity}" = ANY(%s) RETURNING*;'
 
-        cursor = self._query(sql, self.__map_to_identity)
+        cursor = self._manager._lazy_query(
+            sql, (*self._manager.adapt_values(**kwargs), ArrayParam(self.__map_to_identity))
+        )
         result = serializer(cursor, many=True)
+        self._manager._invalidate()
 
         return self.__as_query_set(as_query_set, result)
 
@@ -141,21 +447,19 @@ class QuerySet:
             Users.manager.filter(id=(1, 2, 3,), operand='IN', as_json=False).filter(email='some@gmail.com')
 
             It will make 2 queries:
-            SELECT * FROM "users" WHERE "users"."id" IN (1, 2, 3); -> for example returned 2 users
-            SELECT * FROM "users" WHERE "users"."id" IN (1, 2) AND "users"."email" = some@gmail.com;
+            SELECT * FROM "users" WHERE "users"."id" = ANY('{1,2,3}'); -> for example returned 2 users
+            SELECT * FROM "users" WHERE "users"."id" = ANY('{1,2}') AND "users"."email" = 'some@gmail.com';
         """
         if not self._instances:
             logging.warning('QuerySet is empty nothing to update. Canceling')
             return []
 
         model = normalize_model(self._model)
-        bind = binding(self._instances)
-        sql = f'SELECT * FROM "{model}" WHERE "{model}"."{self._identity}" IN ({bind})'
-        query = get_query(model, *args, **kwargs)
+        sql = f'SELECT * FROM "{model}" WHERE "{model}"."{self._identity}" = ANY(%s)'
+        query, params = get_query(model, *args, **kwargs)
 
         if query:
-            sql += f' AND {query}'
+            sql += f' AND ({query})'
 
-        cursor = self._query(sql, self.__map_to_identity)
-        result = serializer(cursor, many=True)
+        result = self._manager._select(sql, (ArrayParam(self.__map_to_identity), *params), many=True)
         return self.__as_query_set(as_query_set, result)
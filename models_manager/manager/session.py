@@ -0,0 +1,57 @@
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+IdentityKey = Tuple[str, str, Hashable]
+
+_current_session: ContextVar[Optional['Session']] = ContextVar('models_manager_session', default=None)
+
+
+class Session:
+    """
+    Session scope with identity map.
+
+    Inside of the scope every database row is hydrated once. Repeated
+    fetches of the same row return the same model object, and ``get``
+    by identity does not make query, if the object is already in the map.
+
+    Example:
+        with Session():
+            user = User.manager.get(id=1, as_json=False)
+            users = User.manager.filter(id__in=(1, 2), as_json=False)
+
+            users[0] is user -> True
+            User.manager.get(id=1, as_json=False) is user -> True, without query
+    """
+
+    def __init__(self):
+        self._identity_map: Dict[IdentityKey, Any] = {}
+        self._tokens: List[Token] = []
+
+    @classmethod
+    def current(cls) -> Optional['Session']:
+        """Returns active session, None if there is no session"""
+        return _current_session.get()
+
+    def get(self, key: IdentityKey) -> Optional[Any]:
+        return self._identity_map.get(key)
+
+    def add(self, key: IdentityKey, instance: Any):
+        self._identity_map[key] = instance
+
+    def remove(self, key: IdentityKey):
+        self._identity_map.pop(key, None)
+
+    def clear(self):
+        self._identity_map.clear()
+
+    def __len__(self):
+        return len(self._identity_map)
+
+    def __enter__(self) -> 'Session':
+        self._tokens.append(_current_session.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _current_session.reset(self._tokens.pop())
+        if not self._tokens:
+            self.clear()
@@ -0,0 +1,23 @@
+"""
+Pytest plugin with database fixtures. Plugin is registered
+automatically, when models_manager is installed.
+"""
+import pytest
+
+
+@pytest.fixture
+def database_isolation():
+    """
+    Runs test inside of transaction, which is rolled back on teardown.
+    Every query of models managers inside of the test is routed through
+    this transaction, so created, updated and deleted rows are never committed.
+
+    Example:
+        @pytest.mark.usefixtures('database_isolation')
+        def test_user_creation():
+            User.manager.create(username='some')
+    """
+    from models_manager.manager.managers import database
+
+    with database.connection.isolate():
+        yield
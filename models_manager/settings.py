@@ -1,3 +1,8 @@
 DATABASE = {}
 DATABASES = []
 DATABASE_LOGGING = False
+DATABASE_STATS = False
+DATABASE_SLOW_QUERY_THRESHOLD = None
+DATABASE_RETRY = {'times': 5, 'delay': 0.1, 'backoff': 2.0, 'max_delay': 2.0, 'jitter': True, 'deadline': 10.0}
+DATABASE_POOL_SIZE = 10
+DATABASE_BACKEND = 'postgresql'
@@ -6,8 +6,8 @@ import warnings
 from datetime import datetime, date, timedelta, time
 from random import choice, randint, uniform
 from string import ascii_letters, digits
-from time import sleep
-from typing import Union, Optional, List
+from time import monotonic, sleep
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
 
 from faker import Faker
 
@@ -67,22 +67,48 @@ def random_time(end_datetime: Union[date, datetime, timedelta, str, int, None] =
     return fake.time_object(end_datetime=end_datetime)
 
 
-def retry(times, exceptions, delay=2):
+def backoff_delays(times, delay=2, backoff=1.0, max_delay=None, jitter=False) -> Iterator[float]:
+    """
+    :param times: Number of delays
+    :param delay: First delay in seconds
+    :param backoff: Multiplier of the delay for every next attempt
+    :param max_delay: Max delay in seconds
+    :param jitter: If True, random delay from 0 to calculated delay is used,
+    so parallel clients do not retry at the same time
+    :return: Delays between attempts
+
+    Example:
+        >>> list(backoff_delays(times=4, delay=0.1, backoff=2))
+        [0.1, 0.2, 0.4, 0.8]
+    """
+    for attempt in range(times):
+        pause = delay * backoff ** attempt
+        if max_delay is not None:
+            pause = min(pause, max_delay)
+
+        yield uniform(0, pause) if jitter else pause
+
+
+def retry(times, exceptions, delay=2, backoff=1.0, max_delay=None, jitter=False, deadline=None):
     """
     Retry Decorator
     Retries the wrapped function/method `times` times if the exceptions listed
     in ``exceptions`` are thrown
-    :param delay:
+    :param delay: Delay between attempts in seconds
     :param times: The number of times to repeat the wrapped function/method
     :type times: Int
     :param exceptions: List or tuple of exceptions that trigger a retry attempt
+    :param backoff: Multiplier of the delay for every next attempt
+    :param max_delay: Max delay between attempts in seconds
+    :param jitter: Use random delay from 0 to calculated delay
+    :param deadline: Max time in seconds for all attempts
     """
 
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            attempt = 0
-            while attempt < times:
+            started = monotonic()
+            for attempt, pause in enumerate(backoff_delays(times, delay, backoff, max_delay, jitter)):
                 try:
                     return func(*args, **kwargs)
                 except exceptions:
@@ -90,8 +116,11 @@ def retry(times, exceptions, delay=2):
                         'Exception thrown when attempting to run %s, attempt '
                         '%d of %d' % (func, attempt, times)
                     )
-                    attempt += 1
-                sleep(delay)
+
+                if deadline is not None and monotonic() - started + pause > deadline:
+                    break
+
+                sleep(pause)
             return func(*args, **kwargs)
 
         return wrapper
@@ -99,10 +128,80 @@ def retry(times, exceptions, delay=2):
     return decorator
 
 
-def serializer(cursor, many=False):
+class Row(Mapping):
+    """
+    Read-only database row. Values are kept in the fetched tuple and the
+    column index is shared by all rows of the result, so row takes much
+    less memory than dict and is created without copying values.
+    Use ``to_dict`` to get mutable copy
+
+    Example:
+        >>> row = Row({'id': 0, 'name': 1}, (1, 'some'))
+        >>> row['name'], row.get('email')
+        ('some', None)
+        >>> row == {'id': 1, 'name': 'some'}
+        True
+        >>> row.to_dict()
+        {'id': 1, 'name': 'some'}
+    """
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, index: Dict[str, int], values: tuple):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._index[key]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        return default if index is None else self._values[index]
+
+    def to_dict(self) -> dict:
+        return {column: self._values[index] for column, index in self._index.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return self.to_dict() == other.to_dict()
+
+        if isinstance(other, Mapping):
+            return self.to_dict() == other
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'Row({self.to_dict()!r})'
+
+
+@functools.lru_cache(maxsize=1024)
+def column_index(columns: Tuple[str, ...]) -> Dict[str, int]:
+    """
+    Column positions, which are shared by rows of results with the same columns.
+    Last column wins, if name is repeated, same as with dict
+
+    Example:
+        >>> column_index(('id', 'name'))
+        {'id': 0, 'name': 1}
+    """
+    return {column: index for index, column in enumerate(columns)}
+
+
+def serializer(cursor, many=False, as_rows=False):
     """
     :param many:
     :param cursor:
+    :param as_rows: Return read-only ``Row`` objects instead of dicts
     :return:
 
     Will convert db row to dict.
@@ -114,8 +213,13 @@ def serializer(cursor, many=False):
     After serializing such row, result would be like:
     {'id': 1, 'name': 'some_name', 'email': 'some_email@mail.com'}.
     """
-    columns = [column[0] for column in cursor.description]
-    result = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    columns = tuple(column[0] for column in cursor.description)
+    if as_rows:
+        index = column_index(columns)
+        result = [Row(index, row) for row in cursor.fetchall()]
+    else:
+        result = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
     if many:
         return result
 
@@ -170,10 +274,12 @@ def dump_value(value: Union[str, list, tuple, int, float]):
     return value
 
 
+@functools.lru_cache(maxsize=None)
 def normalize_model(model) -> str:
     """
     Model normalizer. Makes model name from "CamelCase"
-    to "snake_case" convention.
+    to "snake_case" convention. Result is cached, because it
+    is called for every query of the model.
 
     Example:
     class MyModel(Model):
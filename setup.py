@@ -16,4 +16,5 @@ setup(
     url="https://github.com/Nikita-Filonov/models_manager",
     packages=find_packages(),
     install_requires=requirements,
+    entry_points={'pytest11': ['models_manager = models_manager.pytest_plugin']},
 )
@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+
+class RecordingCursor:
+    """Cursor which records executed queries and returns prepared rows"""
+
+    def __init__(self):
+        self.queries: List[tuple] = []
+        self.rows: List[tuple] = []
+        self.description: Optional[list] = None
+        self.rowcount = -1
+
+    def prepare(self, columns: List[str], rows: List[tuple]):
+        self.description = [(column,) for column in columns]
+        self.rows = list(rows)
+        self.rowcount = len(self.rows)
+
+    def execute(self, query, args=()):
+        self.queries.append((query, args))
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size=1):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    """Minimal stand-in for the psycopg2 connection"""
+
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+        self._cursor = RecordingCursor()
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
@@ -0,0 +1,34 @@
+import psycopg2
+import pytest
+
+from models_manager import Connect, settings
+from models_manager.manager.managers import database
+from tests.connection import RecordingConnection
+
+
+@pytest.fixture
+def connect(monkeypatch) -> Connect:
+    monkeypatch.setattr(settings, 'DATABASES', ['stuff'])
+    monkeypatch.setattr(psycopg2, 'connect', lambda **kwargs: RecordingConnection())
+
+    instance = Connect()
+    monkeypatch.setattr(database, 'connection', instance)
+    return instance
+
+
+@pytest.fixture
+def cursor(connect):
+    return connect._query_manager('stuff').cursor
+
+
+@pytest.fixture
+def sqlite(monkeypatch) -> Connect:
+    """Connection to in-memory SQLite database, which is dropped on teardown"""
+    monkeypatch.setattr(settings, 'DATABASES', ['stuff'])
+    monkeypatch.setattr(settings, 'DATABASE', {})
+
+    instance = Connect(backend='sqlite')
+    monkeypatch.setattr(database, 'connection', instance)
+
+    yield instance
+    instance.close()
@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import pytest
+from psycopg2.extensions import adapt, string_types
+
+from models_manager import Field, Model
+from models_manager.manager.field.adapters import get_adapter, to_json, to_native, to_text
+from models_manager.manager.query.params import JsonParam
+
+CREATED = datetime(2024, 1, 2, 3, 4, 5)
+TOKEN = uuid.UUID('0b7e1f9c-6a7a-4d0e-9d5c-0f4b0c1f2a3e')
+
+
+class Event(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    token = Field(default=lambda: TOKEN, category=uuid.UUID)
+    created = Field(default=lambda: CREATED, category=datetime)
+    amount = Field(default=lambda: Decimal('1.50'), category=Decimal)
+    code = Field(default=lambda: 10, category=str)
+    payload = Field(default=lambda: {'key': 'value'}, category=dict)
+    tags = Field(category=List[str])
+
+
+@pytest.mark.database
+class TestAdaptation:
+    def test_adapter_is_resolved_by_category(self):
+        assert get_adapter(int) is to_native
+        assert get_adapter(str) is to_text
+        assert get_adapter(Dict[str, int]) is to_json
+        assert get_adapter(Optional[List[int]]) is to_json
+        assert get_adapter(bytes) is to_native
+
+    def test_db_values_are_native(self):
+        values = Event.manager.db_values(tags=['a', 'b'])
+
+        assert values == [1, TOKEN, CREATED, Decimal('1.50'), '10', JsonParam({'key': 'value'}), JsonParam(['a', 'b'])]
+
+    def test_passed_values_are_adapted(self):
+        values = Event.manager.db_values(token=str(TOKEN), amount=2)
+
+        assert values[1] == TOKEN and values[3] == Decimal('2')
+
+    def test_uncategorized_values_are_adapted_by_type(self):
+        class Untyped(Model):
+            database = 'stuff'
+
+            id = Field()
+            meta = Field()
+            tags = Field()
+            name = Field(category=str)
+
+        values = Untyped.manager.db_values(id=5, meta={'a': 1}, tags=['a', 'b'], name=5)
+
+        assert values == [5, JsonParam({'a': 1}), JsonParam(['a', 'b']), '5']
+
+    def test_adapter_is_cached_per_field(self):
+        field = Field(category=dict)
+        field.to_db({})
+
+        assert field._adapter is to_json
+        assert field.to_db(None) is None
+
+    def test_psycopg2_adapts_params(self):
+        assert adapt(JsonParam({'key': 'value'})).getquoted() == b"""'{"key": "value"}'"""
+        assert adapt(TOKEN).getquoted() == f"'{TOKEN}'::uuid".encode()
+
+    def test_uuid_columns_are_read_as_text(self):
+        # UUID, uuid[] type OIDs, registering typecasters would change types of fetched values
+        assert 2950 not in string_types and 2951 not in string_types
+
+    def test_create_sends_adapted_values(self, cursor):
+        cursor.prepare(['id'], [(1,)])
+
+        Event.manager.create(payload={'other': 1})
+
+        assert cursor.queries[-1][1][5] == JsonParam({'other': 1})
+
+    def test_create_rejects_not_db_fields(self, cursor):
+        class Profile(Model):
+            database = 'stuff'
+
+            id = Field(default=1, category=int)
+            nickname = Field(default='some', only_json=True)
+
+        with pytest.raises(ValueError):
+            Profile.manager.create(unknown=1)
+
+        with pytest.raises(ValueError):
+            Profile.manager.create(nickname='other')
+
+        assert not cursor.queries
+
+    def test_update_sends_adapted_values(self, cursor):
+        columns = ['id', 'token', 'created', 'amount', 'code', 'payload', 'tags']
+        row = (1, TOKEN, CREATED, Decimal('1.50'), '10', {}, [])
+
+        cursor.prepare(columns, [row])
+        event = Event.manager.get(id=1, as_json=False)
+        cursor.prepare(columns, [row])
+        event.manager.update(payload={'other': 1}, token=str(TOKEN))
+        assert cursor.queries[-1][1] == (JsonParam({'other': 1}), TOKEN, 1)
+
+        cursor.prepare(columns, [row])
+        events = Event.manager.filter(id=1, as_json=False)
+        cursor.prepare(columns, [row])
+        events.update(tags=['a'])
+        assert cursor.queries[-1][1][0] == JsonParam(['a'])
@@ -0,0 +1,63 @@
+import pytest
+
+from models_manager import Count, Field, Model, Sum
+from models_manager.manager.exceptions import QuerySetOperationError
+from models_manager.manager.query.params import ArrayParam
+
+
+class Payment(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    status = Field(default='new', category=str)
+    amount = Field(default=100, category=int)
+
+
+@pytest.mark.database
+class TestAggregation:
+    def test_aggregate_is_made_on_database_side(self, cursor):
+        query_set = Payment.manager.filter(status='paid', as_json=False)
+        cursor.prepare(['amount__sum', 'total'], [(300, 2)])
+
+        assert query_set.aggregate(Sum('amount'), total=Count('*')) == {'amount__sum': 300, 'total': 2}
+        assert not query_set.is_fetched
+        assert cursor.queries[-1] == (
+            'SELECT SUM("payment"."amount") AS "amount__sum", COUNT(*) AS "total" '
+            'FROM "payment" WHERE "payment"."status" = %s',
+            ('paid',)
+        )
+
+    def test_fetched_query_set_aggregates_own_rows(self, cursor):
+        query_set = Payment.manager.filter(as_json=False)
+        cursor.prepare(['id', 'status', 'amount'], [(1, 'new', 100), (2, 'paid', 200)])
+        list(query_set)
+
+        cursor.prepare(['id__count'], [(2,)])
+        query_set.aggregate(Count('id', distinct=True))
+
+        assert cursor.queries[-1] == (
+            'SELECT COUNT(DISTINCT "payment"."id") AS "id__count" FROM "payment" WHERE "payment"."id" = ANY(%s)',
+            (ArrayParam((1, 2)),)
+        )
+
+    def test_group_by_annotate(self, cursor):
+        cursor.prepare(['status', 'amount__sum'], [('paid', 300), ('new', 100)])
+
+        result = Payment.manager.group_by('status').annotate(Sum('amount'))
+
+        assert result == [{'status': 'paid', 'amount__sum': 300}, {'status': 'new', 'amount__sum': 100}]
+        assert cursor.queries[-1][0] == (
+            'SELECT "payment"."status", SUM("payment"."amount") AS "amount__sum" '
+            'FROM "payment" GROUP BY "payment"."status"'
+        )
+
+    def test_distinct(self, cursor):
+        cursor.prepare(['status'], [('paid',), ('new',)])
+
+        assert Payment.manager.distinct('status') == [{'status': 'paid'}, {'status': 'new'}]
+        assert cursor.queries[-1][0] == 'SELECT DISTINCT "payment"."status" FROM "payment"'
+
+    def test_annotate_without_group_by(self, cursor):
+        with pytest.raises(QuerySetOperationError):
+            Payment.manager.filter(as_json=False).annotate(Count('*'))
@@ -0,0 +1,148 @@
+import asyncio
+import gc
+import threading
+import time
+
+import psycopg2
+import pytest
+
+from models_manager import Field, Model, settings
+from models_manager.manager.managers import async_database
+from tests.connection import RecordingConnection, RecordingCursor
+
+ROWS = [(index, f'some{index}') for index in range(1, 6)]
+
+
+class ScriptedCursor(RecordingCursor):
+    """Cursor, which answers queries from ROWS and remembers executing threads"""
+    threads = set()
+
+    def execute(self, query, args=()):
+        super().execute(query, args)
+        ScriptedCursor.threads.add(threading.get_ident())
+        time.sleep(0.1)
+
+        if query.startswith('SELECT COUNT(*)'):
+            self.prepare(['count'], [(len(ROWS),)])
+        elif query.endswith('LIMIT %s'):
+            last = args[0] if len(args) == 2 else 0
+            self.prepare(['id', 'username'], [row for row in ROWS if row[0] > last][:args[-1]])
+        else:
+            self.prepare(['id', 'username'], ROWS)
+
+
+class ScriptedConnection(RecordingConnection):
+    def __init__(self):
+        super().__init__()
+        self._cursor = ScriptedCursor()
+
+
+class User(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    username = Field(default='some', category=str)
+
+
+@pytest.fixture
+def scripted(monkeypatch, connect):
+    monkeypatch.setattr(psycopg2, 'connect', lambda **kwargs: ScriptedConnection())
+    monkeypatch.setattr(settings, 'DATABASE_POOL_SIZE', 4)
+    monkeypatch.setattr(async_database, '_executor', None)
+    ScriptedCursor.threads = set()
+
+    yield connect
+
+    if async_database._executor is not None:
+        async_database._executor.shutdown()
+
+
+@pytest.mark.database
+class TestAsyncManager:
+    def test_queries_do_not_block_event_loop(self, scripted):
+        async def main():
+            return await asyncio.gather(*[User.manager.acount() for _ in range(4)])
+
+        started = time.perf_counter()
+        assert asyncio.run(main()) == [5, 5, 5, 5]
+
+        assert time.perf_counter() - started < 0.35
+        assert threading.get_ident() not in ScriptedCursor.threads
+
+    def test_aget_and_afilter(self, scripted):
+        async def main():
+            return await User.manager.aget(id=1), await User.manager.afilter(as_json=False)
+
+        user, users = asyncio.run(main())
+
+        assert user == {'id': 1, 'username': 'some1'}
+        assert users.is_fetched
+        assert [instance.username.value for instance in users] == [row[1] for row in ROWS]
+
+    def test_astream_uses_keyset_batches(self, scripted):
+        async def main():
+            return [user async for user in User.manager.astream(as_json=False, batch_size=2)]
+
+        users = asyncio.run(main())
+
+        assert [user.id.value for user in users] == [1, 2, 3, 4, 5]
+
+    def test_lazy_query_set_async_iteration(self, scripted):
+        async def main():
+            return [user async for user in User.manager.filter(as_json=False)]
+
+        assert len(asyncio.run(main())) == 5
+
+    def test_query_inside_transaction_uses_current_thread(self, scripted):
+        with scripted.isolate('stuff'):
+            assert asyncio.run(User.manager.acount()) == 5
+
+        assert ScriptedCursor.threads == {threading.get_ident()}
+
+    def test_transaction_is_not_joined_by_other_coroutines(self, sqlite, monkeypatch):
+        monkeypatch.setattr(async_database, '_executor', None)
+        sqlite.stuff('CREATE TABLE "user" ("id" INTEGER PRIMARY KEY, "username" TEXT NOT NULL)')
+        threads = {}
+
+        async def inside():
+            with User.manager.atomic():
+                await asyncio.sleep(0.1)
+                await User.manager.acreate(id=1)
+                raise ValueError
+
+        async def outside():
+            threads['outside'] = await User.manager._in_executor(threading.get_ident)
+            await User.manager.acreate(id=2)
+
+        async def main():
+            return await asyncio.gather(inside(), outside(), return_exceptions=True)
+
+        try:
+            first, _ = asyncio.run(main())
+        finally:
+            async_database._executor.shutdown()
+            # connections of finished worker threads keep in-memory database alive until collected
+            gc.collect()
+
+        assert isinstance(first, ValueError)
+        assert threads['outside'] != threading.get_ident()
+        assert User.manager.filter() == [{'id': 2, 'username': 'some'}]
+
+    def test_workers_use_backend_of_connection(self, sqlite, monkeypatch):
+        monkeypatch.setattr(async_database, '_executor', None)
+        sqlite.stuff('CREATE TABLE "user" ("id" INTEGER PRIMARY KEY, "username" TEXT NOT NULL)')
+
+        async def main():
+            await User.manager.acreate(id=1, username='first')
+            users = await User.manager.afilter(as_json=False)
+            return await User.manager.acount(), [user.username.value for user in users]
+
+        try:
+            count, usernames = asyncio.run(main())
+        finally:
+            async_database._executor.shutdown()
+            gc.collect()
+
+        assert count == 1
+        assert usernames == ['first']
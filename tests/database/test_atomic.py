@@ -0,0 +1,63 @@
+import pytest
+
+from models_manager import Field, Model
+
+
+class Project(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    title = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestAtomic:
+    def test_query_outside_of_scope_is_committed(self, connect, cursor):
+        connect.stuff('SELECT 1')
+
+        assert connect._query_manager('stuff').connection.commits == 1
+
+    def test_scope_commits_once(self, connect, cursor):
+        cursor.prepare(['count'], [(1,)] * 5)
+
+        with Project.manager.atomic():
+            for _ in range(5):
+                Project.manager.count()
+
+        assert connect._query_manager('stuff').connection.commits == 1
+
+    def test_scope_rolls_back_on_exception(self, connect, cursor):
+        with pytest.raises(ValueError):
+            with connect.atomic('stuff') as query:
+                query('SELECT 1')
+                raise ValueError
+
+        assert connect._query_manager('stuff').connection.commits == 0
+        assert connect._query_manager('stuff').connection.rollbacks == 1
+
+    def test_nested_scope_uses_savepoint(self, connect, cursor):
+        with connect.atomic('stuff'):
+            with pytest.raises(ValueError):
+                with connect.atomic('stuff', synchronous_commit='off'):
+                    raise ValueError
+
+        assert [query for query, _ in cursor.queries] == [
+            'SAVEPOINT models_manager_1;',
+            'SET LOCAL synchronous_commit TO %s;',
+            'ROLLBACK TO SAVEPOINT models_manager_1;',
+            'RELEASE SAVEPOINT models_manager_1;',
+        ]
+        assert connect._query_manager('stuff').connection.commits == 1
+
+    def test_atomic_as_decorator(self, connect, cursor):
+        cursor.prepare(['count'], [(1,)] * 2)
+
+        @Project.manager.atomic()
+        def setup():
+            Project.manager.count()
+            Project.manager.count()
+
+        setup()
+
+        assert connect._query_manager('stuff').connection.commits == 1
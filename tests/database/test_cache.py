@@ -0,0 +1,80 @@
+import pytest
+
+from models_manager import Field, Model
+from models_manager.manager.cache import QueryCache
+
+TABLE = ('stuff', 'role')
+
+
+class Role(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    name = Field(default='admin', category=str)
+
+    class Config:
+        cache_ttl = 60
+
+
+@pytest.fixture
+def query_cache(monkeypatch) -> QueryCache:
+    instance = QueryCache()
+    monkeypatch.setattr('models_manager.manager.managers.database.query_cache', instance)
+    return instance
+
+
+@pytest.mark.database
+class TestQueryCache:
+    def test_entries_are_evicted_by_size(self):
+        query_cache = QueryCache(max_size=2)
+        for key in range(3):
+            query_cache.set(TABLE, key, key, ttl=60)
+
+        assert query_cache.get(TABLE, 0) == (False, None)
+        assert query_cache.get(TABLE, 2) == (True, 2)
+        assert query_cache.stats['evictions'] == 1
+
+    def test_entries_are_expired_by_ttl(self):
+        query_cache = QueryCache()
+        query_cache.set(TABLE, 'key', 'value', ttl=-1)
+
+        assert query_cache.get(TABLE, 'key') == (False, None)
+
+    def test_table_invalidation(self):
+        query_cache = QueryCache()
+        query_cache.set(TABLE, 'key', 'value', ttl=60)
+        query_cache.set(('stuff', 'other'), 'key', 'value', ttl=60)
+        query_cache.invalidate(TABLE)
+
+        assert query_cache.get(TABLE, 'key') == (False, None)
+        assert query_cache.get(('stuff', 'other'), 'key') == (True, 'value')
+        assert query_cache.stats['hit_rate'] == 0.5
+
+    def test_table_written_in_transaction_is_not_stored(self):
+        query_cache = QueryCache()
+        query_cache.invalidate(TABLE, transaction=1)
+        query_cache.set(TABLE, 'key', 'value', ttl=60, transaction=1)
+
+        assert query_cache.get(TABLE, 'key') == (False, None)
+
+        query_cache.set(TABLE, 'key', 'value', ttl=60, transaction=2)
+        assert query_cache.get(TABLE, 'key') == (True, 'value')
+
+    def test_model_reads_are_cached(self, cursor, query_cache):
+        cursor.prepare(['id', 'name'], [(1, 'admin')])
+
+        assert Role.manager.get(id=1) == {'id': 1, 'name': 'admin'}
+        assert Role.manager.get(id=1) == {'id': 1, 'name': 'admin'}
+        assert len(cursor.queries) == 1
+        assert query_cache.stats['hits'] == 1
+
+    def test_model_write_invalidates_cache(self, cursor, query_cache):
+        cursor.prepare(['id', 'name'], [(1, 'admin')])
+        Role.manager.filter(name='admin')
+
+        cursor.prepare(['id', 'name'], [(2, 'admin')])
+        Role.manager.create(id=2)
+
+        cursor.prepare(['id', 'name'], [(1, 'admin'), (2, 'admin')])
+        assert len(Role.manager.filter(name='admin')) == 2
@@ -0,0 +1,92 @@
+import math
+from array import array
+
+import pytest
+
+from models_manager import Field, Model
+from models_manager.manager.exceptions import QuerySetOperationError
+from models_manager.manager.query import columns
+from models_manager.manager.query.columns import ColumnBuilder, fetch_columns
+
+
+class Payment(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(category=int)
+    status = Field(default='new', category=str)
+    amount = Field(default=0.0, category=float)
+    user_id = Field(category=int)
+
+
+@pytest.fixture
+def payments(sqlite):
+    sqlite.stuff(
+        'CREATE TABLE "payment" ('
+        '"id" INTEGER PRIMARY KEY, "status" TEXT NOT NULL, "amount" REAL NOT NULL, "user_id" INTEGER)'
+    )
+    for index in range(1, 8):
+        Payment.manager.create(status='paid' if index % 2 else 'new', amount=index * 1.5, user_id=index % 3)
+
+    return sqlite
+
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(columns, 'numpy', None)
+
+
+@pytest.mark.database
+class TestColumns:
+    def test_typed_columns(self, payments, without_numpy):
+        result = Payment.manager.filter(status='paid', as_json=False).to_columns(['user_id', 'amount', 'status'])
+
+        assert result['user_id'] == array('q', [1, 0, 2, 1])
+        assert result['amount'] == array('d', [1.5, 4.5, 7.5, 10.5])
+        assert result['status'] == ['paid'] * 4
+
+    def test_all_fields_are_fetched_in_chunks(self, payments, without_numpy):
+        result = Payment.manager.filter(as_json=False).to_columns(chunk_size=2)
+
+        assert list(result) == ['id', 'status', 'amount', 'user_id']
+        assert result['id'] == array('q', range(1, 8))
+
+    def test_fetched_query_set(self, payments, without_numpy):
+        query_set = Payment.manager.filter(id__in=(1, 2), as_json=False)
+        len(query_set)
+
+        assert query_set.to_columns(['id'])['id'] == array('q', [1, 2])
+
+    def test_null_and_unexpected_values(self):
+        integers, booleans, floats = ColumnBuilder('q'), ColumnBuilder('b'), ColumnBuilder('q')
+        integers.extend((1, 2))
+        integers.extend((None, 3))
+        booleans.extend((True, None))
+        floats.extend((1, 'other'))
+
+        assert integers.values.typecode == 'd' and math.isnan(integers.values[2])
+        assert booleans.values == [True, None]
+        assert floats.values == [1, 'other']
+
+    def test_fetch_columns_reads_chunks(self, cursor, without_numpy):
+        cursor.prepare(['id', 'name'], [(index, f'name{index}') for index in range(5)])
+
+        result = fetch_columns(cursor, ['id', 'name'], ['q', None], chunk_size=2)
+
+        assert result == {'id': array('q', range(5)), 'name': [f'name{index}' for index in range(5)]}
+
+    def test_at_least_one_field(self, connect):
+        class Empty(Model):
+            database = 'stuff'
+
+        with pytest.raises(QuerySetOperationError):
+            Empty.manager.filter(as_json=False).to_columns()
+
+    def test_numpy_arrays(self, payments):
+        numpy = pytest.importorskip('numpy')
+
+        result = Payment.manager.filter(as_json=False).to_columns(['user_id', 'amount', 'status'])
+
+        assert result['user_id'].dtype == numpy.int64
+        assert result['amount'].sum() == pytest.approx(42.0)
+        assert result['status'].dtype == object
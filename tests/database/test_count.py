@@ -0,0 +1,44 @@
+import pytest
+
+from models_manager import Field, Model
+
+
+class User(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    username = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestCount:
+    def test_manager_count_is_made_on_database_side(self, cursor):
+        cursor.prepare(['count'], [(3,)])
+
+        assert User.manager.count(id__gt=1) == 3
+        assert cursor.queries[-1] == ('SELECT COUNT(*) FROM "user" WHERE "user"."id" > %s', (1,))
+
+    def test_is_exists_uses_limited_exists(self, cursor):
+        cursor.prepare(['exists'], [(True,)])
+
+        assert User.manager.is_exists(id=1) is True
+        assert cursor.queries[-1] == ('SELECT EXISTS(SELECT 1 FROM "user" WHERE "user"."id" = %s LIMIT 1);', (1,))
+
+    def test_lazy_query_set_count_does_not_fetch_rows(self, cursor):
+        query_set = User.manager.filter(username='some', as_json=False)
+        assert not cursor.queries
+
+        cursor.prepare(['count'], [(2,)])
+
+        assert query_set.count() == 2
+        assert not query_set.is_fetched
+        assert cursor.queries[-1] == ('SELECT COUNT(*) FROM "user" WHERE "user"."username" = %s', ('some',))
+
+    def test_fetched_query_set_count_uses_loaded_instances(self, cursor):
+        query_set = User.manager.filter(username='some', as_json=False)
+        cursor.prepare(['id', 'username'], [(1, 'some'), (2, 'some')])
+
+        assert len(query_set) == 2
+        assert query_set.count() == 2
+        assert len(cursor.queries) == 1
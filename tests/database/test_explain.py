@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from models_manager import Field, Model
+from models_manager.manager.exceptions import QuerySetOperationError
+from models_manager.manager.query.params import ArrayParam
+
+PLAN = [{
+    'Plan': {
+        'Node Type': 'Sort', 'Plan Rows': 100, 'Actual Rows': 90, 'Actual Loops': 1,
+        'Sort Key': ['"user"."username"'], 'Sort Space Type': 'Disk', 'Sort Space Used': 2048,
+        'Plans': [{
+            'Node Type': 'Seq Scan', 'Relation Name': 'user', 'Plan Rows': 100, 'Actual Rows': 90000,
+            'Actual Loops': 1, 'Rows Removed by Filter': 10000
+        }]
+    },
+    'Execution Time': 120.5
+}]
+
+
+class User(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    username = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestExplain:
+    def test_explain_returns_plan_with_warnings(self, cursor):
+        query_set = User.manager.filter(username='some', as_json=False)
+        cursor.prepare(['QUERY PLAN'], [(PLAN,)])
+
+        plan = query_set.explain(analyze=True)
+
+        assert not query_set.is_fetched
+        assert cursor.queries[-1] == (
+            'EXPLAIN (ANALYZE true, BUFFERS false, FORMAT JSON) SELECT * FROM "user" WHERE "user"."username" = %s',
+            ('some',)
+        )
+        assert plan.plan['Execution Time'] == 120.5
+        assert [node['Node Type'] for node in plan.nodes()] == ['Sort', 'Seq Scan']
+        assert plan.warnings == [
+            'Sort by "user"."username" spilled to disk (2048 kB), increase work_mem',
+            'Seq Scan on "user" reads 100000 rows, index may be missing',
+            'Seq Scan on "user" estimated 100 rows, actual 90000 rows, statistics may be outdated'
+        ]
+
+    def test_explain_without_analyze_uses_estimates(self, cursor):
+        plan = [{'Plan': {'Node Type': 'Index Scan', 'Relation Name': 'user', 'Plan Rows': 1}}]
+        cursor.prepare(['QUERY PLAN'], [(json.dumps(plan),)])
+
+        result = User.manager.filter(as_json=False).explain()
+
+        assert result.plan == plan[0]
+        assert result.warnings == []
+
+    def test_selective_seq_scan_without_analyze(self, cursor, monkeypatch):
+        plan = [{'Plan': {'Node Type': 'Seq Scan', 'Relation Name': 'user', 'Plan Rows': 1}}]
+        execute = cursor.execute
+
+        def answer(query, args=()):
+            execute(query, args)
+            if 'pg_class' in query:
+                cursor.prepare(['relname', 'reltuples'], [('user', 250000.0)])
+
+        monkeypatch.setattr(cursor, 'execute', answer)
+        cursor.prepare(['QUERY PLAN'], [(json.dumps(plan),)])
+
+        result = User.manager.filter(username='some', as_json=False).explain()
+
+        assert result.warnings == ['Seq Scan on "user" reads 250000 rows, index may be missing']
+        assert cursor.queries[-1][1] == (ArrayParam(['user']),)
+
+    def test_text_format(self, cursor):
+        cursor.prepare(['QUERY PLAN'], [('Seq Scan on "user"',), ('  Filter: (username = \'some\')',)])
+
+        plan = User.manager.filter(as_json=False).explain(format='text')
+
+        assert plan.plan == 'Seq Scan on "user"\n  Filter: (username = \'some\')'
+
+    def test_unsupported_format(self, cursor):
+        with pytest.raises(QuerySetOperationError):
+            User.manager.filter(as_json=False).explain(format='html')
@@ -0,0 +1,62 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+
+from models_manager import Connect, settings
+from tests.connection import RecordingConnection, RecordingCursor
+
+
+class SlowCursor(RecordingCursor):
+    """Cursor, which takes fixed time for every query and remembers executing thread"""
+
+    def __init__(self, dbname: str):
+        super().__init__()
+        self.dbname = dbname
+        self.threads = set()
+
+    def execute(self, query, args=()):
+        super().execute(query, args)
+        self.threads.add(threading.get_ident())
+        time.sleep(0.2)
+        self.prepare(['database'], [(self.dbname,)])
+
+
+class SlowConnection(RecordingConnection):
+    def __init__(self, dbname: str):
+        super().__init__()
+        self._cursor = SlowCursor(dbname)
+
+
+@pytest.fixture
+def connect(monkeypatch) -> Connect:
+    monkeypatch.setattr(settings, 'DATABASES', ['users', 'billing', 'orders'])
+    monkeypatch.setattr(psycopg2, 'connect', lambda **kwargs: SlowConnection(kwargs['dbname']))
+    return Connect()
+
+
+@pytest.mark.database
+class TestGather:
+    def test_queries_are_executed_concurrently(self, connect):
+        started = time.perf_counter()
+        result = connect.gather({
+            'users': 'SELECT %s AS "database"',
+            'billing': ('SELECT %s AS "database"', (1,)),
+            'orders': 'SELECT %s AS "database"'
+        })
+        duration = time.perf_counter() - started
+
+        assert result == {
+            'users': [{'database': 'users'}],
+            'billing': [{'database': 'billing'}],
+            'orders': [{'database': 'orders'}]
+        }
+        assert duration < 0.5
+
+        cursors = [connect._query_manager(db).cursor for db in ('users', 'billing', 'orders')]
+        assert cursors[1].queries == [('SELECT %s AS "database"', (1,))]
+        assert len(set.union(*[cursor.threads for cursor in cursors])) == 3
+
+    def test_single_row(self, connect):
+        assert connect.gather({'users': 'SELECT 1'}, many=False) == {'users': {'database': 'users'}}
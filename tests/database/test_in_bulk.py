@@ -0,0 +1,45 @@
+import pytest
+from psycopg2.extensions import adapt
+
+from models_manager import Field, Model, Session
+from models_manager.manager.query.params import ArrayParam
+
+
+class Device(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    serial = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestInBulk:
+    def test_array_param_is_untyped_literal(self):
+        assert adapt(ArrayParam(['a', 'b'])).getquoted() == b"""'{"a","b"}'"""
+
+    def test_in_bulk_is_one_query_with_array_param(self, cursor):
+        cursor.prepare(['id', 'serial'], [(1, 'first'), (2, 'second')])
+
+        result = Device.manager.in_bulk([1, 2, 3])
+
+        assert result == {1: {'id': 1, 'serial': 'first'}, 2: {'id': 2, 'serial': 'second'}}
+        assert cursor.queries == [('SELECT * FROM "device" WHERE "device"."id" = ANY(%s)', (ArrayParam([1, 2, 3]),))]
+
+    def test_in_bulk_takes_objects_from_session(self, cursor):
+        with Session():
+            cursor.prepare(['id', 'serial'], [(1, 'first')])
+            device = Device.manager.get(id=1, as_json=False)
+
+            cursor.prepare(['id', 'serial'], [(2, 'second')])
+            result = Device.manager.in_bulk([1, 2], as_json=False)
+
+            assert result[1] is device
+            assert result[2].serial.value == 'second'
+            assert cursor.queries[-1][1] == (ArrayParam([2]),)
+
+    def test_exists_many(self, cursor):
+        cursor.prepare(['id'], [(1,), (3,)])
+
+        assert Device.manager.exists_many(range(1, 4)) == {1, 3}
+        assert cursor.queries[-1][0] == 'SELECT "device"."id" FROM "device" WHERE "device"."id" = ANY(%s)'
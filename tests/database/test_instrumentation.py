@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+
+from models_manager import settings
+from models_manager.instrumentation import QueryRecord, QueryStats, query_listeners, query_shape
+
+
+@pytest.fixture
+def records():
+    captured = []
+    query_listeners.append(captured.append)
+    yield captured
+    query_listeners.remove(captured.append)
+
+
+@pytest.mark.database
+class TestInstrumentation:
+    @pytest.mark.parametrize('sql, shape', [
+        ('SELECT * FROM "user" WHERE "user"."id" = 5', 'SELECT * FROM "user" WHERE "user"."id" = ?'),
+        ('SELECT * FROM "user" WHERE "user"."name" = \'it\'\'s\'', 'SELECT * FROM "user" WHERE "user"."name" = ?'),
+        ('SELECT * FROM "user" WHERE "user"."id" IN (1, 2, 3)', 'SELECT * FROM "user" WHERE "user"."id" IN (...)'),
+        ('SELECT * FROM "user_2" WHERE "user_2"."id" = %s', 'SELECT * FROM "user_2" WHERE "user_2"."id" = %s'),
+    ])
+    def test_query_shape(self, sql, shape):
+        assert query_shape(sql) == shape
+
+    def test_stats_percentiles(self):
+        stats = QueryStats()
+        for duration in range(1, 101):
+            stats.record(QueryRecord('SELECT 1', (), 'stuff', duration / 1000, 1))
+
+        summary = stats.summary()['SELECT ?']
+        assert summary['count'] == 100
+        assert summary['rows'] == 100
+        assert summary['p50'] == pytest.approx(0.051)
+        assert summary['p95'] == pytest.approx(0.095)
+        assert summary['max'] == pytest.approx(0.1)
+
+    def test_listener_receives_record(self, connect, cursor, records):
+        cursor.prepare(['id'], [(1,), (2,)])
+        connect.stuff('SELECT "id" FROM "user"')
+
+        record, = records
+        assert record.database == 'stuff'
+        assert record.rows == 2
+        assert record.operation == 'SELECT'
+        assert record.table == 'user'
+        assert record.duration >= 0
+
+    def test_slow_query_is_logged(self, connect, cursor, monkeypatch, caplog):
+        monkeypatch.setattr(settings, 'DATABASE_SLOW_QUERY_THRESHOLD', 0)
+
+        with caplog.at_level(logging.WARNING, logger='models_manager.queries'):
+            connect.stuff('SELECT 1')
+
+        assert 'Slow query [stuff] SELECT 1' in caplog.text
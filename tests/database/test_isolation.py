@@ -0,0 +1,35 @@
+import pytest
+
+from models_manager.pytest_plugin import database_isolation  # noqa
+from tests.connection import RecordingConnection
+
+
+@pytest.mark.database
+class TestIsolation:
+    def test_isolation_rolls_back_committed_scopes(self, connect, cursor):
+        with connect.isolate():
+            connect.stuff('INSERT INTO "user" DEFAULT VALUES')
+            with connect.atomic('stuff'):
+                connect.stuff('INSERT INTO "user" DEFAULT VALUES')
+
+        connection: RecordingConnection = connect._query_manager('stuff').connection
+        assert connection.commits == 0
+        assert connection.rollbacks == 1
+
+    def test_nested_isolation_uses_savepoint(self, connect, cursor):
+        with connect.atomic('stuff'):
+            with connect.isolate('stuff'):
+                connect.stuff('INSERT INTO "user" DEFAULT VALUES')
+
+        assert [query for query, _ in cursor.queries] == [
+            'SAVEPOINT models_manager_1;',
+            'INSERT INTO "user" DEFAULT VALUES',
+            'ROLLBACK TO SAVEPOINT models_manager_1;',
+            'RELEASE SAVEPOINT models_manager_1;',
+        ]
+
+    def test_fixture_keeps_transaction_open(self, connect, cursor, database_isolation):
+        connect.stuff('INSERT INTO "user" DEFAULT VALUES')
+
+        assert connect._query_manager('stuff').in_transaction
+        assert connect._query_manager('stuff').connection.commits == 0
@@ -0,0 +1,61 @@
+import time
+from typing import List
+
+import psycopg2
+import pytest
+
+from models_manager import Connect, settings
+from models_manager.manager.exceptions import DatabaseNameError
+from tests.connection import RecordingConnection
+
+
+@pytest.fixture
+def opened(monkeypatch) -> List[str]:
+    opened = []
+
+    def connect(**kwargs):
+        time.sleep(0.2)
+        opened.append(kwargs['dbname'])
+        return RecordingConnection()
+
+    monkeypatch.setattr(settings, 'DATABASES', ['users', 'billing', 'orders'])
+    monkeypatch.setattr(psycopg2, 'connect', connect)
+    return opened
+
+
+@pytest.mark.database
+class TestLazyConnections:
+    def test_connection_is_opened_on_first_query(self, opened):
+        connect = Connect()
+        query = connect.users
+        assert opened == []
+
+        query('SELECT 1')
+        query('SELECT 2')
+
+        assert opened == ['users']
+
+    def test_context_manager_opens_only_own_database(self, opened):
+        with Connect('billing') as query:
+            query('SELECT 1')
+
+        assert opened == ['billing']
+
+    def test_warm_up_opens_connections_concurrently(self, opened):
+        connect = Connect()
+
+        started = time.perf_counter()
+        connect.warm_up()
+        duration = time.perf_counter() - started
+
+        assert sorted(opened) == ['billing', 'orders', 'users']
+        assert duration < 0.5
+
+        connect.warm_up('users')
+        assert len(opened) == 3
+
+    def test_not_configured_database(self, opened):
+        with pytest.raises(DatabaseNameError):
+            Connect().unknown('SELECT 1')
+
+        assert opened == []
@@ -0,0 +1,69 @@
+import pytest
+
+from models_manager import Field, Model
+from models_manager.instrumentation import QueryCounter
+
+
+class Team(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    name = Field(default='some', category=str)
+
+
+class Player(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    team_id = Field(category=int, is_related=True)
+
+
+@pytest.mark.database
+class TestPrefetchRelated:
+    def test_related_objects_are_loaded_with_one_query(self, cursor):
+        players = Player.manager.filter(as_json=False)
+
+        with QueryCounter(budget=2) as counter:
+            cursor.prepare(['id', 'team_id'], [(1, 10), (2, 10), (3, 20), (4, None)])
+            list(players)
+
+            cursor.prepare(['id', 'name'], [(10, 'first')])
+            players.prefetch_related('team_id', model=Team)
+
+        assert counter.count == 2
+        assert players[0].team is players[1].team
+        assert players[0].team.name.value == 'first'
+        assert players[2].team is None
+        assert players[3].team is None
+
+    def test_custom_attribute_and_related_field(self, cursor):
+        cursor.prepare(['id', 'team_id'], [(1, 10)])
+        players = Player.manager.filter(as_json=False)
+        list(players)
+
+        cursor.prepare(['id', 'name'], [(10, 'first')])
+        players.prefetch_related('team_id', model=Team, to_attr='club', related_field='name')
+
+        assert players[0].club is None
+        assert cursor.queries[-1][0] == 'SELECT * FROM "team" WHERE "team"."name" = ANY(%s)'
+
+    def test_null_foreign_key_with_default(self, cursor):
+        class Member(Model):
+            identity = 'id'
+            database = 'stuff'
+
+            id = Field(default=1, category=int)
+            team_id = Field(default=10, category=int, is_related=True)
+
+        cursor.prepare(['id', 'team_id'], [(1, None), (2, 10)])
+        members = Member.manager.filter(as_json=False)
+        list(members)
+
+        cursor.prepare(['id', 'name'], [(10, 'first')])
+        members.prefetch_related('team_id', model=Team)
+
+        assert members[0].team is None
+        assert members[1].team.name.value == 'first'
+        assert cursor.queries[-1][1][0] == (10,)
@@ -0,0 +1,104 @@
+import pytest
+
+from models_manager import Field, Model, Q
+from models_manager.manager.query.builder import compile_query, get_query, parse_lookup, shape_to_query
+from models_manager.manager.query.params import ArrayParam
+
+
+class User(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    username = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestQuery:
+    def test_in_query_text_does_not_depend_on_number_of_values(self, cursor):
+        cursor.prepare(['id', 'username'], [])
+        User.manager.filter(id__in=(1, 2, 3))
+        cursor.prepare(['id', 'username'], [])
+        User.manager.filter(id__in=list(range(3000)))
+
+        (short_sql, short_args), (long_sql, long_args) = cursor.queries[-2:]
+
+        assert short_sql == long_sql == 'SELECT * FROM "user" WHERE "user"."id" = ANY(%s)'
+        assert short_args == (ArrayParam((1, 2, 3)),)
+        assert isinstance(long_args[0], ArrayParam) and len(long_args[0]) == 3000
+
+    def test_not_in(self):
+        assert get_query('user', id__not_in=[1, 2]) == ('"user"."id" <> ALL(%s)', (ArrayParam((1, 2)),))
+
+    def test_values_are_parameters(self):
+        assert get_query('user', username="O'Brien", id__gt=5) == (
+            '"user"."username" = %s AND "user"."id" > %s', ("O'Brien", 5)
+        )
+
+    def test_node_parameters_follow_query_order(self):
+        query = Q(id__in=(1, 2)) | Q(username='some', id__lt=10)
+
+        assert get_query('user', query, username__like='other%') == (
+            '"user"."username" LIKE %s AND ("user"."id" = ANY(%s) OR ("user"."username" = %s AND "user"."id" < %s))',
+            ('other%', ArrayParam((1, 2)), 'some', 10)
+        )
+
+    def test_only_last_template_is_removed_from_column(self):
+        assert parse_lookup('is__in_stock__in') == ('is__in_stock', '__in', '= ANY')
+        assert parse_lookup('price__lt__lt') == ('price__lt', '__lt', '<')
+        assert parse_lookup('__in') == ('__in', '', '=')
+        assert get_query('user', is__in_stock=True) == ('"user"."is__in_stock" = %s', (True,))
+
+    def test_query_is_cached_per_key_set(self):
+        compile_query.cache_clear()
+
+        first = get_query('user', Q(id=1) | Q(id=2), username='some', id__in=(1, 2))
+        second = get_query('user', Q(id=3) | Q(id=4), username='other', id__in=(3, 4, 5))
+
+        assert first[0] == second[0]
+        assert second[1] == ('other', ArrayParam((3, 4, 5)), 3, 4)
+        assert compile_query.cache_info().hits == 1
+
+
+class TestQ:
+    def test_same_operator_is_flattened(self):
+        query = Q(id=1)
+        for index in range(2, 1001):
+            query = query | Q(id=index)
+
+        sql, params = query.to_query()
+
+        assert sql == ' OR '.join(['"{model}"."id" = %s'] * 1000)
+        assert params == tuple(range(1, 1001))
+
+    def test_different_operators_are_grouped(self):
+        query = (Q(id=1) & Q(username='some')) | Q(id=2) | (Q(id=3) & Q(username='other'))
+
+        assert query.to_query() == (
+            '("{model}"."id" = %s AND "{model}"."username" = %s) OR "{model}"."id" = %s OR '
+            '("{model}"."id" = %s AND "{model}"."username" = %s)',
+            (1, 'some', 2, 3, 'other')
+        )
+
+    def test_negation(self):
+        assert (~Q(id__in=(1, 2)) & Q(username='some')).to_query() == (
+            'NOT ("{model}"."id" = ANY(%s)) AND "{model}"."username" = %s',
+            (ArrayParam((1, 2)), 'some')
+        )
+        assert (~(Q(id=1) | Q(id=2))).to_query() == ('NOT ("{model}"."id" = %s OR "{model}"."id" = %s)', (1, 2))
+        assert (~~Q(id=1)).to_query() == ('"{model}"."id" = %s', (1,))
+
+    def test_operands_are_not_changed(self):
+        first, second = Q(id=1), Q(id=2)
+        first | second
+        first & Q(username='some')
+
+        assert str(first) == '"{model}"."id" = %s'
+
+    def test_query_is_cached_per_shape(self):
+        shape_to_query.cache_clear()
+
+        (Q(id=1) | Q(username='some')).to_query()
+        (Q(id=2) | Q(username='other')).to_query()
+
+        assert shape_to_query.cache_info().hits == 1
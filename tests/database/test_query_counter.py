@@ -0,0 +1,40 @@
+import pytest
+
+from models_manager.instrumentation import QueryCounter, query_listeners
+from models_manager.manager.exceptions import QueryBudgetError
+
+
+@pytest.mark.database
+class TestQueryCounter:
+    def test_queries_are_counted_per_shape(self, connect, cursor):
+        with QueryCounter() as counter:
+            connect.stuff('SELECT * FROM "user" WHERE "user"."id" = 1')
+            connect.stuff('SELECT * FROM "user" WHERE "user"."id" = 2')
+            connect.stuff('SELECT * FROM "role"')
+
+        assert counter.count == 3
+        assert counter.shapes == {
+            'SELECT * FROM "user" WHERE "user"."id" = ?': 2,
+            'SELECT * FROM "role"': 1
+        }
+        assert not query_listeners
+
+    def test_budget_is_exceeded(self, connect, cursor):
+        with pytest.raises(QueryBudgetError, match='Executed 2 queries, budget is 1'):
+            with QueryCounter(budget=1):
+                connect.stuff('SELECT 1')
+                connect.stuff('SELECT 2')
+
+    def test_repeated_shape_is_reported(self, connect, cursor):
+        with pytest.raises(QueryBudgetError) as error:
+            with QueryCounter(repeated=1):
+                for user_id in range(3):
+                    connect.stuff(f'SELECT * FROM "user" WHERE "user"."id" = {user_id}')
+
+        assert 'likely N+1' in str(error.value)
+        assert 'Repeated 3 times: SELECT * FROM "user" WHERE "user"."id" = ?' in str(error.value)
+        assert '[stuff] SELECT * FROM "user" WHERE "user"."id" = 2 ()' in str(error.value)
+
+    def test_other_database_is_ignored(self, connect, cursor):
+        with QueryCounter(budget=0, database='other'):
+            connect.stuff('SELECT 1')
@@ -0,0 +1,94 @@
+import pytest
+from psycopg2 import OperationalError
+
+from models_manager import settings
+from models_manager.connect import QueryManager
+from models_manager.utils import backoff_delays, retry
+from tests.connection import RecordingConnection
+
+
+class DroppedConnection(RecordingConnection):
+    """Connection which is lost on the first query"""
+
+    def __init__(self, closed=2):
+        super().__init__()
+        self._closed_on_error = closed
+        self._cursor.execute = self._drop
+
+    def _drop(self, query, args=()):
+        self.closed = self._closed_on_error
+        raise OperationalError('server closed the connection unexpectedly')
+
+
+@pytest.fixture(autouse=True)
+def no_delay(monkeypatch):
+    monkeypatch.setattr(settings, 'DATABASE_RETRY', {'times': 3, 'delay': 0, 'deadline': 1})
+
+
+def query_manager(connection):
+    connections = []
+
+    def connect():
+        connections.append(RecordingConnection())
+        return connections[-1]
+
+    return QueryManager(connection, connection.cursor(), 'stuff', connect), connections
+
+
+@pytest.mark.database
+class TestReconnect:
+    def test_read_query_is_retried_on_new_connection(self):
+        dropped = DroppedConnection()
+        manager, connections = query_manager(dropped)
+
+        cursor = manager.query('SELECT 1')
+
+        new_connection, = connections
+        assert cursor is new_connection.cursor()
+        assert cursor.queries == [('SELECT 1', ())]
+        assert dropped.closed
+
+    def test_write_query_is_not_retried(self):
+        manager, connections = query_manager(DroppedConnection())
+
+        manager.query('INSERT INTO "user" DEFAULT VALUES')
+        assert not connections
+
+        manager.query('INSERT INTO "user" DEFAULT VALUES')
+        assert connections[0].cursor().queries == [('INSERT INTO "user" DEFAULT VALUES', ())]
+
+    def test_query_in_transaction_is_not_retried(self):
+        manager, connections = query_manager(DroppedConnection())
+        manager.begin()
+
+        with pytest.raises(OperationalError):
+            manager.query('SELECT 1')
+
+        manager.rollback()
+        assert not connections
+
+    def test_alive_connection_is_not_invalidated(self):
+        alive = DroppedConnection(closed=0)
+        manager, connections = query_manager(alive)
+
+        manager.query('SELECT 1')
+
+        assert not connections
+        assert alive.rollbacks == 1
+
+    def test_backoff_delays(self):
+        assert list(backoff_delays(times=5, delay=1, backoff=2, max_delay=5)) == [1, 2, 4, 5, 5]
+        assert all(0 <= pause <= 1 for pause in backoff_delays(times=5, delay=1, jitter=True))
+
+    def test_retry_stops_on_deadline(self):
+        calls = []
+
+        @retry(times=10, exceptions=(ValueError,), delay=5, deadline=1)
+        def failing():
+            calls.append(1)
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            failing()
+
+        assert len(calls) == 2
@@ -0,0 +1,86 @@
+import copy
+import json
+import pickle
+
+import pytest
+from jsonschema import ValidationError, validate
+
+from models_manager import Field, Model, Row, Session
+from models_manager.utils import column_index, serializer
+
+
+class Client(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, json='id', category=int)
+    name = Field(default='some', json='name', category=str)
+
+
+@pytest.mark.database
+class TestRow:
+    def test_mapping_access(self):
+        row = Row(column_index(('id', 'name')), (1, 'some'))
+
+        assert row['name'] == 'some'
+        assert row.get('email', 'default') == 'default'
+        assert list(row) == ['id', 'name'] and len(row) == 2 and 'id' in row
+        assert dict(row) == row.to_dict() == {'id': 1, 'name': 'some'}
+        assert {**row, 'name': 'other'} == {'id': 1, 'name': 'other'}
+
+        with pytest.raises(KeyError):
+            row['email']
+
+        with pytest.raises(TypeError):
+            row['name'] = 'other'
+
+    def test_equality_and_copies(self):
+        row = Row(column_index(('id', 'name')), (1, 'some'))
+
+        assert row == {'id': 1, 'name': 'some'} and row != {'id': 1}
+        assert row == Row(column_index(('name', 'id')), ('some', 1))
+        assert pickle.loads(pickle.dumps(row)) == row
+        assert copy.deepcopy(row) == row
+
+    def test_rows_share_column_index(self, cursor):
+        cursor.prepare(['id', 'name'], [(1, 'first'), (2, 'second')])
+
+        first, second = serializer(cursor, many=True, as_rows=True)
+
+        assert first._index is second._index
+
+    def test_filter_returns_rows(self, cursor):
+        cursor.prepare(['id', 'name'], [(1, 'first'), (2, 'second')])
+
+        rows = Client.manager.filter(id__in=(1, 2))
+
+        assert all(isinstance(row, Row) for row in rows)
+        assert rows == [{'id': 1, 'name': 'first'}, {'id': 2, 'name': 'second'}]
+
+    def test_dict_results_for_schema_and_json(self, cursor):
+        cursor.prepare(['id', 'name'], [(1, 'first'), (2, 'second')])
+        rows = Client.manager.filter(id__in=(1, 2), as_rows=False)
+
+        assert all(type(row) is dict for row in rows)
+        validate(rows, Client.manager.to_array_schema)
+        assert json.loads(json.dumps(rows)) == [{'id': 1, 'name': 'first'}, {'id': 2, 'name': 'second'}]
+
+    def test_rows_are_not_dicts(self, cursor):
+        cursor.prepare(['id', 'name'], [(1, 'first')])
+        rows = Client.manager.filter(id=1)
+
+        with pytest.raises(ValidationError):
+            validate(rows, Client.manager.to_array_schema)
+
+        with pytest.raises(TypeError):
+            json.dumps(rows)
+
+        validate([row.to_dict() for row in rows], Client.manager.to_array_schema)
+
+    def test_row_is_hydrated(self):
+        row = Row(column_index(('id', 'name')), (1, 'first'))
+
+        with Session():
+            client = Client.manager._to_instance(row)
+
+        assert client.id.value == 1 and client.name.value == 'first'
@@ -0,0 +1,45 @@
+import pytest
+
+from models_manager import Field, Model
+
+
+class Article(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    title = Field(default='some', category=str)
+    body = Field(default='some', category=str)
+
+
+@pytest.fixture
+def article(cursor):
+    cursor.prepare(['id', 'title', 'body'], [(1, 'title', 'body')])
+    instance = Article.manager.get(id=1, as_json=False)
+    cursor.queries.clear()
+    return instance
+
+
+@pytest.mark.database
+class TestSave:
+    def test_unchanged_object_is_not_saved(self, cursor, article):
+        article.manager.save()
+
+        assert not article.manager.changed_fields()
+        assert not cursor.queries
+
+    def test_only_changed_fields_are_saved(self, cursor, article):
+        article.title.value = 'other'
+        cursor.prepare(['id', 'title', 'body'], [(1, 'other', 'body')])
+
+        assert list(article.manager.changed_fields()) == ['title']
+
+        article.manager.save()
+
+        assert cursor.queries == [('UPDATE "article" SET "title" = %s WHERE "article"."id" = %s RETURNING *;', ['other', 1])]
+        assert not article.manager.changed_fields()
+
+    def test_same_value_is_not_change(self, article):
+        article.title.value = 'title'
+
+        assert not article.title.is_changed
@@ -0,0 +1,65 @@
+import pytest
+
+from models_manager import Field, Model
+from models_manager.manager.session import Session
+
+
+class Account(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    login = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestSession:
+    def test_same_row_is_hydrated_once(self, cursor):
+        with Session() as session:
+            cursor.prepare(['id', 'login'], [(1, 'some')])
+            account = Account.manager.get(id=1, as_json=False)
+
+            cursor.prepare(['id', 'login'], [(1, 'some'), (2, 'other')])
+            accounts = list(Account.manager.filter(login__like='%', as_json=False))
+
+            assert accounts[0] is account
+            assert len(session) == 2
+
+    def test_get_by_identity_does_not_query(self, cursor):
+        with Session():
+            cursor.prepare(['id', 'login'], [(1, 'some')])
+            account = Account.manager.get(id=1, as_json=False)
+
+            assert Account.manager.get(id=1, as_json=False) is account
+            assert len(cursor.queries) == 1
+
+    def test_update_refreshes_mapped_object(self, cursor):
+        with Session():
+            cursor.prepare(['id', 'login'], [(1, 'some')])
+            account = Account.manager.get(id=1, as_json=False)
+
+            cursor.prepare(['id', 'login'], [(1, 'other')])
+            updated = account.manager.update(login='other', as_json=False)
+
+            assert updated is account
+            assert account.login.value == 'other'
+
+    def test_objects_are_not_shared_outside_of_session(self, cursor):
+        cursor.prepare(['id', 'login'], [(1, 'some')])
+        account = Account.manager.get(id=1, as_json=False)
+
+        cursor.prepare(['id', 'login'], [(1, 'some')])
+        assert Account.manager.get(id=1, as_json=False) is not account
+        assert Session.current() is None
+
+    def test_query_set_update_refreshes_mapped_objects(self, cursor):
+        with Session():
+            cursor.prepare(['id', 'login'], [(1, 'some')])
+            accounts = Account.manager.filter(id=1, as_json=False)
+            account = accounts[0]
+
+            cursor.prepare(['id', 'login'], [(1, 'other')])
+            assert accounts.update(login='other') == [{'id': 1, 'login': 'other'}]
+
+            assert account.login.value == 'other'
+            assert not account.manager.changed_fields()
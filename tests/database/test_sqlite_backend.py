@@ -0,0 +1,185 @@
+import pytest
+
+from models_manager import Count, Field, Model, Q, Session, Sum
+from models_manager.backends import Backend
+from models_manager.manager.exceptions import ModelDoesNotExists, QuerySetOperationError
+
+
+class Account(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(category=int)
+    username = Field(default='some', category=str)
+    balance = Field(default=0, category=int)
+
+
+@pytest.fixture
+def accounts(sqlite):
+    sqlite.stuff(
+        'CREATE TABLE "account" ('
+        '"id" INTEGER PRIMARY KEY, "username" TEXT UNIQUE NOT NULL, "balance" INTEGER NOT NULL)'
+    )
+    for index in range(1, 6):
+        Account.manager.create(username=f'user{index}', balance=index * 100)
+
+    return sqlite
+
+
+@pytest.mark.database
+class TestSQLiteBackend:
+    def test_create_and_get(self, accounts):
+        created = Account.manager.create(username='other', balance=10)
+
+        assert created == {'id': 6, 'username': 'other', 'balance': 10}
+        assert Account.manager.get(username='other') == created
+
+        with pytest.raises(ModelDoesNotExists):
+            Account.manager.get(username='unknown')
+
+    def test_filter_with_lookups_and_nodes(self, accounts):
+        assert [row['id'] for row in Account.manager.filter(id__in=(1, 3, 10))] == [1, 3]
+        assert [row['id'] for row in Account.manager.filter(id__not_in=[1, 2], balance__lt=500)] == [3, 4]
+        assert [row['id'] for row in Account.manager.filter(Q(id=1) | ~Q(balance__le=400))] == [1, 5]
+        assert [row['id'] for row in Account.manager.filter(username__like='user%', id__gt=4)] == [5]
+
+    def test_lazy_query_set(self, accounts):
+        query_set = Account.manager.filter(id__in=(1, 2, 3), as_json=False)
+
+        assert query_set.count() == 3
+        assert query_set.aggregate(Sum('balance'), Count('*')) == {'balance__sum': 600, 'count': 3}
+        assert [account.username.value for account in query_set.filter(id__gt=1)] == ['user2', 'user3']
+
+        query_set.update(balance=0)
+        assert Account.manager.count(balance=0) == 3
+
+        query_set.delete()
+        assert Account.manager.count() == 2
+
+    def test_instance_update_save_and_delete(self, accounts):
+        account = Account.manager.get(id=1, as_json=False)
+        account.manager.update(balance=1)
+
+        account.username.value = 'renamed'
+        account.manager.save()
+        assert Account.manager.get(id=1) == {'id': 1, 'username': 'renamed', 'balance': 1}
+
+        account.manager.delete()
+        assert not Account.manager.is_exists(id=1)
+
+    def test_update_values_are_bound(self, accounts):
+        account = Account.manager.get(id=2, as_json=False)
+
+        assert account.manager.update(username="O'Brien") == {'id': 2, 'username': "O'Brien", 'balance': 200}
+
+    def test_in_bulk_and_exists_many(self, accounts):
+        assert set(Account.manager.in_bulk([1, 2, 10])) == {1, 2}
+        assert Account.manager.exists_many([1, 2, 10]) == {1, 2}
+
+        with Session():
+            accounts = Account.manager.in_bulk([1, 2], as_json=False)
+            assert Account.manager.get(id=1, as_json=False) is accounts[1]
+
+    def test_get_or_create_and_upsert(self, accounts):
+        existing = Account.manager.get_or_create(username='user1', conflict_fields=['username'])
+        created = Account.manager.get_or_create(username='new', conflict_fields=['username'])
+
+        assert existing['id'] == 1
+        assert created['id'] == 6
+
+        upserted = Account.manager.upsert(conflict_fields=['username'], username='user2', balance=7)
+        assert upserted == {'id': 2, 'username': 'user2', 'balance': 7}
+
+        rows = Account.manager.upsert_many(
+            [{'username': 'user3', 'balance': 8}, {'username': 'third', 'balance': 9}], conflict_fields=['username']
+        )
+        assert [(row['username'], row['balance']) for row in rows] == [('user3', 8), ('third', 9)]
+
+    def test_update_many(self, accounts):
+        updated = Account.manager.update_many([{'id': 1, 'balance': 11}, {'id': 2, 'balance': 22}], fields=['balance'])
+
+        assert updated == 2
+        assert [row['balance'] for row in Account.manager.filter(id__in=(1, 2))] == [11, 22]
+
+    def test_grouping_and_distinct(self, accounts):
+        Account.manager.update_many([{'id': 1, 'balance': 200}], fields=['balance'])
+
+        assert Account.manager.group_by('balance').annotate(Count('*')) == [
+            {'balance': 200, 'count': 2}, {'balance': 300, 'count': 1},
+            {'balance': 400, 'count': 1}, {'balance': 500, 'count': 1}
+        ]
+        assert len(Account.manager.distinct('balance')) == 4
+
+    def test_atomic_and_isolate(self, accounts):
+        with pytest.raises(ValueError):
+            with Account.manager.atomic():
+                Account.manager.create(username='rolled_back')
+                raise ValueError
+
+        with accounts.isolate():
+            Account.manager.create(username='isolated')
+            with Account.manager.atomic():
+                Account.manager.create(username='nested')
+
+            assert Account.manager.count() == 7
+
+        assert Account.manager.count() == 5
+
+    def test_explain_is_not_supported(self, accounts):
+        with pytest.raises(QuerySetOperationError):
+            Account.manager.filter(as_json=False).explain()
+
+    def test_json_values_are_stored_as_text(self, sqlite):
+        sqlite.stuff('CREATE TABLE "profile" ("id" INTEGER PRIMARY KEY, "settings" TEXT)')
+
+        class Profile(Model):
+            identity = 'id'
+            database = 'stuff'
+
+            id = Field(category=int)
+            settings = Field(default=dict, category=dict)
+
+        assert Profile.manager.create(settings={'theme': 'dark'}) == {'id': 1, 'settings': '{"theme": "dark"}'}
+
+    def test_backend_should_implement_connect_and_json_records(self):
+        class Partial(Backend):
+            def connect(self, dbname: str):
+                return None
+
+        with pytest.raises(TypeError):
+            Partial()
+
+    def test_update_many_keeps_null_columns(self, sqlite):
+        sqlite.stuff('CREATE TABLE "note" ("id" INTEGER PRIMARY KEY, "title" TEXT, "body" TEXT)')
+        sqlite.stuff('INSERT INTO "note" ("id", "title", "body") VALUES (1, \'first\', NULL)')
+
+        class Note(Model):
+            identity = 'id'
+            database = 'stuff'
+
+            id = Field(category=int)
+            title = Field(category=str)
+            body = Field(default=lambda: 'generated', category=str)
+
+        note = Note.manager.get(id=1, as_json=False)
+        note.title.value = 'renamed'
+        Note.manager.update_many([note])
+
+        assert Note.manager.get(id=1) == {'id': 1, 'title': 'renamed', 'body': None}
+
+    def test_save_clears_nullable_column(self, sqlite):
+        sqlite.stuff('CREATE TABLE "member" ("id" INTEGER PRIMARY KEY, "nick" TEXT)')
+        sqlite.stuff('INSERT INTO "member" ("id", "nick") VALUES (1, \'some\')')
+
+        class Member(Model):
+            identity = 'id'
+            database = 'stuff'
+
+            id = Field(category=int)
+            nick = Field(default=lambda: 'generated', category=str)
+
+        member = Member.manager.get(id=1, as_json=False)
+        member.nick.value = None
+        member.manager.save()
+
+        assert Member.manager.get(id=1) == {'id': 1, 'nick': None}
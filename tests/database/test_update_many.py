@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from models_manager import Field, Model, Session
+
+
+class Ticket(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    id = Field(default=1, category=int)
+    status = Field(default='open', category=str)
+    title = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestUpdateMany:
+    def test_rows_are_updated_with_one_query_per_batch(self, connect, cursor):
+        cursor.rowcount = 2
+        rows = [{'id': index, 'status': f'status {index}'} for index in range(3)]
+
+        updated = Ticket.manager.update_many(rows, fields=['status'], batch_size=2)
+
+        assert updated == 4
+        assert len(cursor.queries) == 2
+        sql, (payload,) = cursor.queries[0]
+        assert sql == (
+            'UPDATE "ticket" SET "status" = "values"."status" '
+            'FROM json_populate_recordset(NULL::"ticket", %s) AS "values" '
+            'WHERE "ticket"."id" = "values"."id";'
+        )
+        assert json.loads(payload) == rows[:2]
+        assert connect._query_manager('stuff').connection.commits == 1
+
+    def test_values_are_taken_from_objects(self, cursor):
+        cursor.prepare(['id', 'status', 'title'], [(1, 'open', 'first')])
+        ticket = Ticket.manager.get(id=1, as_json=False)
+        ticket.status.value = 'closed'
+
+        Ticket.manager.update_many([ticket])
+
+        _, (payload,) = cursor.queries[-1]
+        assert json.loads(payload) == [{'id': 1, 'status': 'closed', 'title': 'first'}]
+
+    def test_objects_are_marked_unchanged(self, cursor):
+        cursor.prepare(['id', 'status', 'title'], [(1, 'open', 'first')])
+        ticket = Ticket.manager.get(id=1, as_json=False)
+        ticket.status.value = 'closed'
+
+        Ticket.manager.update_many([ticket], fields=['status'])
+
+        assert not ticket.manager.changed_fields()
+
+    def test_session_objects_are_evicted(self, cursor):
+        with Session():
+            cursor.prepare(['id', 'status', 'title'], [(1, 'open', 'first'), (2, 'open', 'second')])
+            first, second = Ticket.manager.filter(id__in=(1, 2), as_json=False)
+            second.status.value = 'closed'
+
+            Ticket.manager.update_many([{'id': 1, 'status': 'closed'}, second], fields=['status'])
+
+            assert Ticket.manager.get(id=2, as_json=False) is second
+            cursor.prepare(['id', 'status', 'title'], [(1, 'closed', 'first')])
+            fetched = Ticket.manager.get(id=1, as_json=False)
+
+            assert fetched is not first and fetched.status.value == 'closed'
+
+    def test_values_are_taken_from_rows(self, cursor):
+        cursor.prepare(['id', 'status', 'title'], [(1, 'open', 'first')])
+        rows = Ticket.manager.filter(id=1)
+
+        Ticket.manager.update_many(rows, fields=['status'])
+
+        _, (payload,) = cursor.queries[-1]
+        assert json.loads(payload) == [{'id': 1, 'status': 'open'}]
@@ -0,0 +1,58 @@
+import pytest
+
+from models_manager import Field, Model
+from models_manager.manager.exceptions import ModelOperationError
+
+
+class Member(Model):
+    identity = 'id'
+    database = 'stuff'
+
+    email = Field(default='some@mail.com', category=str)
+    name = Field(default='some', category=str)
+
+
+@pytest.mark.database
+class TestUpsert:
+    def test_get_or_create_with_conflict_fields_is_one_query(self, cursor):
+        cursor.prepare(['email', 'name'], [('first@mail.com', 'first')])
+
+        result = Member.manager.get_or_create(email='first@mail.com', name='first', conflict_fields=['email'])
+
+        (sql, args), = cursor.queries
+        assert result == {'email': 'first@mail.com', 'name': 'first'}
+        assert sql == (
+            'WITH "inserted" AS (INSERT INTO "member" ("email", "name") VALUES (%s, %s) '
+            'ON CONFLICT ("email") DO NOTHING RETURNING *) SELECT * FROM "inserted" '
+            'UNION ALL SELECT * FROM "member" WHERE "member"."email" = %s LIMIT 1;'
+        )
+        assert args == ['first@mail.com', 'first', 'first@mail.com']
+
+    def test_upsert_updates_passed_fields(self, cursor):
+        cursor.prepare(['email', 'name'], [('first@mail.com', 'first')])
+
+        Member.manager.upsert(conflict_fields=['email'], email='first@mail.com', name='first')
+
+        assert cursor.queries[-1][0] == (
+            'INSERT INTO "member" ("email", "name") VALUES (%s, %s) '
+            'ON CONFLICT ("email") DO UPDATE SET "name" = EXCLUDED."name" RETURNING *;'
+        )
+
+    def test_upsert_many_makes_query_per_batch_in_one_transaction(self, connect, cursor):
+        rows = [{'email': f'{index}@mail.com', 'name': str(index)} for index in range(5)]
+        cursor.prepare(['email', 'name'], [])
+
+        Member.manager.upsert_many(rows, conflict_fields=['email'], batch_size=2)
+
+        queries = [sql for sql, _ in cursor.queries]
+        assert len(queries) == 3
+        assert queries[0] == (
+            'INSERT INTO "member" ("email", "name") VALUES (%s, %s), (%s, %s) '
+            'ON CONFLICT ("email") DO UPDATE SET "name" = EXCLUDED."name" RETURNING *;'
+        )
+        assert cursor.queries[-1][1] == ['4@mail.com', '4']
+        assert connect._query_manager('stuff').connection.commits == 1
+
+    def test_upsert_without_conflict_fields(self, cursor):
+        with pytest.raises(ModelOperationError):
+            Member.manager.upsert(conflict_fields=[], name='first')